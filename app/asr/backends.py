@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from whisper import DecodingResult
+
+SAMPLE_RATE = 16000
+LANGUAGE = "ru"
+
+# openai-whisper's transcribe() defaults, applied to batched decodes too.
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+@dataclass(frozen=True)
+class AsrSettings:
+    backend: str = "whisper"
+    model_name: str = "tiny"  # оптимально для слабого ПК
+    threads: int = 0  # 0 - значение библиотеки по умолчанию
+    compute_type: str = "int8"
+
+
+class AsrBackend(ABC):
+    def __init__(self, settings: AsrSettings) -> None:
+        self.settings = settings
+
+    @abstractmethod
+    def load(self) -> None:
+        ...
+
+    @abstractmethod
+    def transcribe(self, audio: np.ndarray) -> str:
+        ...
+
+    def transcribe_batch(self, clips: list[np.ndarray]) -> list[str]:
+        return [self.transcribe(audio) for audio in clips]
+
+    def warm_up(self) -> None:
+        self.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+
+class WhisperBackend(AsrBackend):
+    """openai-whisper on CPU; compute_type is ignored (always fp32)."""
+
+    def __init__(self, settings: AsrSettings) -> None:
+        super().__init__(settings)
+        self._model = None
+
+    def load(self) -> None:
+        import torch
+        import whisper
+
+        if self.settings.threads:
+            torch.set_num_threads(self.settings.threads)
+        self._model = whisper.load_model(self.settings.model_name, device="cpu")
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        result = self._model.transcribe(audio, language=LANGUAGE, fp16=False)
+        return result["text"].strip()
+
+    def transcribe_batch(self, clips: list[np.ndarray]) -> list[str]:
+        import torch
+        import whisper
+
+        texts = [""] * len(clips)
+        # Clips that fit into one 30 s window are padded to it and decoded in a
+        # single batched pass; longer ones need the sliding-window transcribe.
+        short: list[int] = []
+        for i, audio in enumerate(clips):
+            if len(audio) <= whisper.audio.N_SAMPLES:
+                short.append(i)
+            else:
+                texts[i] = self.transcribe(audio)
+        if not short:
+            return texts
+
+        mel = torch.stack(
+            [
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(clips[i]), self._model.dims.n_mels)
+                for i in short
+            ]
+        ).to(self._model.device)
+        options = whisper.DecodingOptions(language=LANGUAGE, fp16=False, without_timestamps=True)
+        for i, result in zip(short, whisper.decode(self._model, mel, options)):
+            texts[i] = self._checked_text(result, clips[i])
+        return texts
+
+    def _checked_text(self, result: DecodingResult, audio: np.ndarray) -> str:
+        # A bare decode has neither transcribe()'s silence check nor its
+        # temperature fallback, so a clip would read differently depending
+        # on whether it shared a batch; the same rules are applied here.
+        silent = result.no_speech_prob > NO_SPEECH_THRESHOLD
+        if silent and result.avg_logprob <= LOGPROB_THRESHOLD:
+            return ""
+        if not silent and (
+            result.compression_ratio > COMPRESSION_RATIO_THRESHOLD or result.avg_logprob < LOGPROB_THRESHOLD
+        ):
+            return self.transcribe(audio)
+        return result.text.strip()
+
+
+class FasterWhisperBackend(AsrBackend):
+    """CTranslate2 engine from the optional faster-whisper package."""
+
+    def __init__(self, settings: AsrSettings) -> None:
+        super().__init__(settings)
+        self._model = None
+
+    def load(self) -> None:
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as exc:
+            raise RuntimeError(
+                "WHISPER_BACKEND=faster-whisper требует пакет faster-whisper"
+            ) from exc
+
+        self._model = WhisperModel(
+            self.settings.model_name,
+            device="cpu",
+            compute_type=self.settings.compute_type,
+            cpu_threads=self.settings.threads,
+        )
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        segments, _ = self._model.transcribe(audio, language=LANGUAGE)
+        return "".join(segment.text for segment in segments).strip()
+
+
+BACKENDS: dict[str, type[AsrBackend]] = {
+    "whisper": WhisperBackend,
+    "faster-whisper": FasterWhisperBackend,
+}
+
+
+def create_backend(settings: AsrSettings) -> AsrBackend:
+    try:
+        backend_cls = BACKENDS[settings.backend]
+    except KeyError:
+        raise ValueError(f"Unknown ASR backend: {settings.backend}") from None
+    return backend_cls(settings)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.asr.backends import AsrSettings
+from app.asr.whisper_asr import STAGE_SECONDS
+from app.asr.worker import init_worker, run_transcribe, run_transcribe_batch, worker_pid
+from app.config import (
+    ASR_BATCH_SIZE,
+    ASR_BATCH_WAIT_MS,
+    ASR_MAX_PENDING,
+    ASR_MAX_PENDING_PER_USER,
+    ASR_WORKERS,
+    WHISPER_BACKEND,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_MODEL,
+    WHISPER_THREADS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionQueueFull(Exception):
+    pass
+
+
+class TranscriptionDisabled(Exception):
+    pass
+
+
+@dataclass
+class _Job:
+    user_id: int
+    audio: np.ndarray = field(repr=False)
+    future: asyncio.Future = field(repr=False)
+
+
+class TranscriptionService:
+    """Bounded pool of Whisper worker processes fed by a per-user fair queue.
+
+    Each worker process loads its own model. Users are served round-robin,
+    so one user sending many voice notes cannot starve the others, and
+    clips that arrive close together are decoded as one batch.
+    """
+
+    def __init__(
+        self,
+        workers: int = ASR_WORKERS,
+        max_pending: int = ASR_MAX_PENDING,
+        max_pending_per_user: int = ASR_MAX_PENDING_PER_USER,
+        batch_size: int = ASR_BATCH_SIZE,
+        batch_wait: float = ASR_BATCH_WAIT_MS / 1000,
+        settings: AsrSettings | None = None,
+    ) -> None:
+        self.settings = settings or AsrSettings(
+            backend=WHISPER_BACKEND,
+            model_name=WHISPER_MODEL,
+            threads=WHISPER_THREADS,
+            compute_type=WHISPER_COMPUTE_TYPE,
+        )
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_pending_per_user = max_pending_per_user
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._queues: dict[int, deque[_Job]] = {}
+        self._ring: deque[int] = deque()
+        self._pending = 0
+        self._ready = asyncio.Condition()
+        self._executor: ProcessPoolExecutor | None = None
+        self._dispatchers: list[asyncio.Task] = []
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    async def start(self) -> None:
+        # ASR_WORKERS=0 turns speech recognition off; voice notes are then
+        # answered with VOICE_DISABLED before anything is downloaded.
+        if self._executor is not None or self.workers <= 0:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(self.settings,),
+        )
+        # Every submit spawns a worker that loads and warms up its model
+        # before taking work, so the first voice message does not pay for it.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, worker_pid) for _ in range(self.workers))
+        )
+        logger.info("ASR workers ready: %s x %s", self.workers, self.settings)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+
+        for queue in self._queues.values():
+            for job in queue:
+                if not job.future.done():
+                    job.future.cancel()
+        self._queues.clear()
+        self._ring.clear()
+        self._pending = 0
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def transcribe(self, user_id: int, audio: np.ndarray) -> str:
+        texts = await self.transcribe_segments(user_id, [audio])
+        return texts[0]
+
+    async def transcribe_segments(self, user_id: int, segments: list[np.ndarray]) -> list[str]:
+        if self._executor is None:
+            raise TranscriptionDisabled()
+
+        loop = asyncio.get_running_loop()
+        jobs = [_Job(user_id, audio, loop.create_future()) for audio in segments]
+        async with self._ready:
+            # Limits are checked per request, so one long note split into
+            # several segments is never rejected halfway.
+            queue = self._queues.get(user_id)
+            if self._pending >= self.max_pending or (
+                queue is not None and len(queue) >= self.max_pending_per_user
+            ):
+                raise TranscriptionQueueFull()
+
+            if queue is None:
+                queue = self._queues[user_id] = deque()
+                self._ring.append(user_id)
+            queue.extend(jobs)
+            self._pending += len(jobs)
+            self._ready.notify(len(jobs))
+
+        return list(await asyncio.gather(*(job.future for job in jobs)))
+
+    def _pop_job(self) -> _Job:
+        user_id = self._ring.popleft()
+        queue = self._queues[user_id]
+        job = queue.popleft()
+        if queue:
+            self._ring.append(user_id)
+        else:
+            del self._queues[user_id]
+        self._pending -= 1
+        return job
+
+    async def _next_batch(self) -> list[_Job]:
+        # Take the first job, then keep collecting for up to batch_wait seconds
+        # or until batch_size clips, so concurrent voice notes share one pass.
+        loop = asyncio.get_running_loop()
+        async with self._ready:
+            while not self._ring:
+                await self._ready.wait()
+
+            batch = [self._pop_job()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                if self._ring:
+                    batch.append(self._pop_job())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+        batch = [job for job in batch if not job.future.done()]
+        batch.sort(key=lambda job: len(job.audio))
+        return batch
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            try:
+                with STAGE_SECONDS.time(stage="model"):
+                    if len(batch) == 1:
+                        texts = [await loop.run_in_executor(self._executor, run_transcribe, batch[0].audio)]
+                    else:
+                        texts = await loop.run_in_executor(
+                            self._executor,
+                            run_transcribe_batch,
+                            [job.audio for job in batch],
+                        )
+            except asyncio.CancelledError:
+                for job in batch:
+                    job.future.cancel()
+                raise
+            except Exception as exc:
+                logger.exception("Transcription failed for a batch of %s clips", len(batch))
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(exc)
+            else:
+                for job, text in zip(batch, texts):
+                    if not job.future.done():
+                        job.future.set_result(text)
+
+
+transcriber = TranscriptionService()
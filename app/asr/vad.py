@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.asr.backends import SAMPLE_RATE
+
+FRAME_MS = 30
+MIN_SPEECH_MS = 150
+MAX_PAUSE_MS = 600
+PAD_MS = 200
+MAX_SEGMENT_SECONDS = 30.0
+ABSOLUTE_THRESHOLD_DB = -45.0
+NOISE_MARGIN_DB = 12.0
+# Speech is never required to be louder than this far below the loudest
+# frame, so steady audio or speech over loud noise still counts.
+PEAK_MARGIN_DB = 6.0
+
+
+@dataclass(frozen=True)
+class VadResult:
+    segments: list[np.ndarray]
+    total_seconds: float
+    speech_seconds: float
+    # True when no speech was found in audible audio and the whole clip
+    # was kept rather than trusting the energy detector.
+    fallback: bool = False
+
+    @property
+    def saved_seconds(self) -> float:
+        return self.total_seconds - self.speech_seconds
+
+
+def _speech_runs(audio: np.ndarray, sample_rate: int) -> tuple[list[tuple[int, int]], bool]:
+    """Return the speech runs and whether any frame is above the silence floor."""
+    frame = sample_rate * FRAME_MS // 1000
+    count = len(audio) // frame
+    if count == 0:
+        return [], False
+
+    frames = audio[: count * frame].reshape(count, frame)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    peak_db = float(energy_db.max())
+    if peak_db <= ABSOLUTE_THRESHOLD_DB:
+        return [], False
+
+    # Adapt to the background level, capped below the peak, but never call
+    # near-silence speech.
+    adaptive = min(float(np.percentile(energy_db, 10)) + NOISE_MARGIN_DB, peak_db - PEAK_MARGIN_DB)
+    voiced = energy_db > max(ABSOLUTE_THRESHOLD_DB, adaptive)
+    if not voiced.any():
+        return [], True
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    runs = list(zip(edges[::2], edges[1::2]))
+
+    max_pause = MAX_PAUSE_MS // FRAME_MS
+    merged = [runs[0]]
+    for start, end in runs[1:]:
+        if start - merged[-1][1] <= max_pause:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    min_speech = MIN_SPEECH_MS // FRAME_MS
+    pad = PAD_MS * sample_rate // 1000
+    runs = [
+        (max(start * frame - pad, 0), min(end * frame + pad, len(audio)))
+        for start, end in merged
+        if end - start >= min_speech
+    ]
+    return runs, True
+
+
+def detect_speech(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> VadResult:
+    """Drop silence and pack the remaining speech into clips of at most 30 s.
+
+    Audible audio in which no speech was detected is kept whole, so a
+    misjudged clip still reaches Whisper; only near-silence yields nothing.
+    """
+    total_seconds = len(audio) / sample_rate
+    runs, audible = _speech_runs(audio, sample_rate)
+    fallback = audible and not runs
+    if fallback:
+        runs = [(0, len(audio))]
+
+    max_samples = int(MAX_SEGMENT_SECONDS * sample_rate)
+    segments: list[np.ndarray] = []
+    current: list[np.ndarray] = []
+    current_length = 0
+    speech_samples = 0
+    for start, end in runs:
+        for offset in range(start, end, max_samples):
+            piece = audio[offset:min(offset + max_samples, end)]
+            speech_samples += len(piece)
+            if current and current_length + len(piece) > max_samples:
+                segments.append(np.concatenate(current))
+                current, current_length = [], 0
+            current.append(piece)
+            current_length += len(piece)
+    if current:
+        segments.append(np.concatenate(current))
+
+    return VadResult(
+        segments=segments,
+        total_seconds=total_seconds,
+        speech_seconds=speech_samples / sample_rate,
+        fallback=fallback,
+    )
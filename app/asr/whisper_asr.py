@@ -1,51 +1,56 @@
-from pathlib import Path
-import whisper
-import subprocess
-
-AUDIO_DIR = Path("data/audio")
-MODEL_NAME = "tiny"  # оптимально для слабого ПК
-
-_model = None
-
-
-def load_model():
-    global _model
-    if _model is None:
-        _model = whisper.load_model(MODEL_NAME)
-    return _model
-
-
-def ogg_to_wav(ogg_path: Path) -> Path:
-    wav_path = ogg_path.with_suffix(".wav")
-
-    subprocess.run(
-        [
-            "ffmpeg",
-            "-y",
-            "-i", str(ogg_path),
-            "-ar", "16000",
-            "-ac", "1",
-            str(wav_path),
-        ],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        check=True,
+import asyncio
+
+import numpy as np
+
+from app.asr.backends import SAMPLE_RATE, AsrBackend, AsrSettings, create_backend
+from app.utils.metrics import histogram
+
+# Stages of one voice note: download, ffmpeg, vad and model. The model runs
+# in ASR worker processes, so the service times it from the bot process.
+STAGE_SECONDS = histogram("bot_asr_stage_seconds", "Time spent in each speech recognition stage.", ("stage",))
+
+_backend: AsrBackend | None = None
+
+
+def load_model(settings: AsrSettings | None = None, warm_up: bool = False) -> AsrBackend:
+    global _backend
+    if _backend is None:
+        backend = create_backend(settings or AsrSettings())
+        backend.load()
+        if warm_up:
+            backend.warm_up()
+        _backend = backend
+    return _backend
+
+
+async def decode_ogg(data: bytes) -> np.ndarray:
+    with STAGE_SECONDS.time(stage="ffmpeg"):
+        pcm = await _run_ffmpeg(data)
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+async def _run_ffmpeg(data: bytes) -> bytes:
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-i", "pipe:0",
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "-ar", str(SAMPLE_RATE),
+        "-ac", "1",
+        "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
     )
+    pcm, _ = await process.communicate(data)
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with code {process.returncode}")
+    return pcm
 
-    return wav_path
 
+def transcribe(audio: np.ndarray) -> str:
+    return load_model().transcribe(audio)
 
-def transcribe(ogg_path: Path) -> str:
-    wav_path = ogg_to_wav(ogg_path)
-    model = load_model()
 
-    try:
-        result = model.transcribe(
-            str(wav_path),
-            language="ru",
-            fp16=False
-        )
-        return result["text"].strip()
-    finally:
-        if wav_path.exists():
-            wav_path.unlink()
+def transcribe_batch(clips: list[np.ndarray]) -> list[str]:
+    return load_model().transcribe_batch(clips)
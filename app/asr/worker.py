@@ -0,0 +1,22 @@
+import os
+
+import numpy as np
+
+from app.asr.backends import AsrSettings
+from app.asr.whisper_asr import load_model, transcribe, transcribe_batch
+
+
+def init_worker(settings: AsrSettings) -> None:
+    load_model(settings, warm_up=True)
+
+
+def worker_pid() -> int:
+    return os.getpid()
+
+
+def run_transcribe(audio: np.ndarray) -> str:
+    return transcribe(audio)
+
+
+def run_transcribe_batch(clips: list[np.ndarray]) -> list[str]:
+    return transcribe_batch(clips)
@@ -9,10 +9,18 @@ from aiogram.types import CallbackQuery, InlineKeyboardButton, Message
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.bot import messages
-from app.db.reminders_repo import delete_reminder, list_user_reminders
-from app.db.tasks_repo import get_task_by_id
-from app.services.reminders import DEFAULT_TZ, schedule_reminder
-from app.services.tasks import list_tasks
+from app.bot.pagination import nav_buttons, parse_cursor
+from app.schemas.task import TaskPage
+from app.services.reminders import (
+    DEFAULT_TZ,
+    delete_reminder_by_id,
+    delete_reminder_by_index,
+    get_reminders,
+    list_reminders,
+    schedule_reminder,
+)
+from app.services.tasks import list_tasks_page
+from app.utils.text import shorten
 
 router = Router()
 
@@ -24,12 +32,6 @@ class RemindStates(StatesGroup):
     WaitingTime = State()
 
 
-def _shorten(text: str, limit: int = 40) -> str:
-    if len(text) <= limit:
-        return text
-    return f"{text[:limit - 3]}..."
-
-
 def _format_remaining(delta: timedelta) -> str:
     total_seconds = int(delta.total_seconds())
     if total_seconds <= 0:
@@ -52,15 +54,14 @@ def _format_remaining(delta: timedelta) -> str:
     return " ".join(parts)
 
 
-def _build_reminders_list(user_id: int):
-    reminders = list_user_reminders(user_id)
+async def _build_reminders_list(user_id: int):
+    reminders = await list_reminders(user_id)
     if not reminders:
         return messages.REMIND_LIST_EMPTY
 
     now = datetime.now(timezone.utc)
     lines = [messages.REMIND_LIST_HEADER]
-    for i, reminder in enumerate(reminders, start=1):
-        task_record = get_task_by_id(user_id, reminder.task_id)
+    for i, (reminder, task_record) in enumerate(reminders, start=1):
         title = task_record.task.title if task_record else "(\u0437\u0430\u0434\u0430\u0447\u0430 \u0443\u0434\u0430\u043b\u0435\u043d\u0430)"
 
         next_dt = datetime.fromisoformat(reminder.next_fire_at)
@@ -76,25 +77,10 @@ def _build_reminders_list(user_id: int):
     return "\n".join(lines)
 
 
-def _delete_reminder_by_index(user_id: int, index: int) -> bool:
-    reminders = list_user_reminders(user_id)
-    if not (0 <= index < len(reminders)):
-        return False
-
-    delete_reminder(reminders[index].id)
-    return True
-
-
-@router.message(Command("remind"))
-async def remind_start(message: Message, state: FSMContext):
-    tasks = list_tasks(message.from_user.id)
-    if not tasks:
-        await message.answer(messages.REMIND_NO_TASKS)
-        return
-
+def _tasks_markup(page: TaskPage, offset: int):
     builder = InlineKeyboardBuilder()
-    for index, record in enumerate(tasks, start=1):
-        title = _shorten(record.task.title)
+    for index, record in enumerate(page.records, start=offset + 1):
+        title = shorten(record.task.title)
         builder.add(
             InlineKeyboardButton(
                 text=f"{index}. {title}",
@@ -102,32 +88,61 @@ async def remind_start(message: Message, state: FSMContext):
             )
         )
     builder.adjust(1)
+    buttons = nav_buttons("remind_page", page, offset)
+    if buttons:
+        builder.row(*buttons)
+    return builder.as_markup()
+
+
+@router.message(Command("remind"))
+async def remind_start(message: Message, state: FSMContext):
+    page = await list_tasks_page(message.from_user.id)
+    if not page.records:
+        await message.answer(messages.REMIND_NO_TASKS)
+        return
 
     await state.set_state(RemindStates.ChoosingTask)
-    await message.answer(messages.REMIND_CHOOSE_TASK, reply_markup=builder.as_markup())
+    await message.answer(messages.REMIND_CHOOSE_TASK, reply_markup=_tasks_markup(page, 0))
+
+
+@router.callback_query(F.data.startswith("remind_page:"))
+async def remind_page(callback: CallbackQuery):
+    cursor = parse_cursor(callback.data)
+    if cursor is None:
+        await callback.answer()
+        return
+
+    page = await list_tasks_page(callback.from_user.id, cursor.after_id, cursor.before_id)
+    if not page.records:
+        await callback.message.edit_text(messages.REMIND_NO_TASKS)
+        await callback.answer()
+        return
+
+    await callback.message.edit_reply_markup(reply_markup=_tasks_markup(page, cursor.offset))
+    await callback.answer()
 
 
 @router.message(Command("reminders"))
 async def reminders_list(message: Message):
-    text = _build_reminders_list(message.from_user.id)
+    text = await _build_reminders_list(message.from_user.id)
     await message.answer(text)
 
 
 @router.message(Command("unremind"))
 async def unremind_handler(message: Message):
     parts = message.text.split()
-    reminders = list_user_reminders(message.from_user.id)
+    reminders = await get_reminders(message.from_user.id)
     if not reminders:
         await message.answer(messages.REMIND_LIST_EMPTY)
         return
 
     if len(parts) != 2 or not parts[1].isdigit():
         builder = InlineKeyboardBuilder()
-        for i in range(len(reminders)):
+        for i, reminder in enumerate(reminders, start=1):
             builder.add(
                 InlineKeyboardButton(
-                    text=str(i + 1),
-                    callback_data=f"unremind:{i+1}",
+                    text=str(i),
+                    callback_data=f"unremind:{reminder.id}",
                 )
             )
         builder.adjust(3)
@@ -138,7 +153,7 @@ async def unremind_handler(message: Message):
         return
 
     index = int(parts[1]) - 1
-    deleted = _delete_reminder_by_index(message.from_user.id, index)
+    deleted = await delete_reminder_by_index(message.from_user.id, index)
     if not deleted:
         await message.answer(
             "\u041d\u0435\u0442 \u043d\u0430\u043f\u043e\u043c\u0438\u043d\u0430\u043d\u0438\u044f \u0441 \u0442\u0430\u043a\u0438\u043c \u043d\u043e\u043c\u0435\u0440\u043e\u043c."
@@ -160,8 +175,8 @@ async def unremind_callback(callback: CallbackQuery):
         await callback.answer()
         return
 
-    index = int(parts[1]) - 1
-    deleted = _delete_reminder_by_index(callback.from_user.id, index)
+    reminder_id = int(parts[1])
+    deleted = await delete_reminder_by_id(callback.from_user.id, reminder_id)
     if not deleted:
         await callback.answer(
             "\u041d\u0435\u0442 \u043d\u0430\u043f\u043e\u043c\u0438\u043d\u0430\u043d\u0438\u044f \u0441 \u0442\u0430\u043a\u0438\u043c \u043d\u043e\u043c\u0435\u0440\u043e\u043c.",
@@ -206,6 +221,6 @@ async def remind_time_input(message: Message, state: FSMContext):
         await message.answer(messages.REMIND_BAD_TIME)
         return
 
-    schedule_reminder(message.from_user.id, task_id, value, tz=DEFAULT_TZ)
+    await schedule_reminder(message.from_user.id, task_id, value, tz=DEFAULT_TZ)
     await state.clear()
     await message.answer(messages.REMIND_SAVED)
@@ -4,15 +4,58 @@ from aiogram.types import CallbackQuery, InlineKeyboardButton, Message
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.bot import messages
-from app.db.reminders_repo import delete_by_task
-from app.services.tasks import create_tasks, delete_task_by_index, list_tasks
+from app.bot.pagination import nav_buttons, parse_cursor
+from app.schemas.task import TaskPage
+from app.services.tasks import (
+    create_tasks,
+    delete_task_by_id,
+    delete_task_by_index,
+    list_tasks_page,
+)
+from app.utils.text import shorten
 
 router = Router()
 
+# Keeps a full page well below Telegram's 4096-character message limit.
+LIST_TITLE_LIMIT = 150
+
+
+def _render_list(page: TaskPage, offset: int) -> str:
+    lines = []
+    for i, record in enumerate(page.records, start=offset + 1):
+        line = shorten(record.task.title, LIST_TITLE_LIMIT)
+        if record.task.due_date:
+            line = f"{line} — до {record.task.due_date.isoformat()}"
+        lines.append(f"{i}. {line}")
+    return messages.LIST_HEADER + "\n".join(lines)
+
+
+def _list_markup(page: TaskPage, offset: int):
+    buttons = nav_buttons("list_page", page, offset)
+    if not buttons:
+        return None
+    return InlineKeyboardBuilder().row(*buttons).as_markup()
+
+
+def _done_markup(page: TaskPage, offset: int):
+    builder = InlineKeyboardBuilder()
+    for i, record in enumerate(page.records, start=offset + 1):
+        builder.add(
+            InlineKeyboardButton(
+                text=str(i),
+                callback_data=f"done:{record.id}",
+            )
+        )
+    builder.adjust(3)
+    buttons = nav_buttons("done_page", page, offset)
+    if buttons:
+        builder.row(*buttons)
+    return builder.as_markup()
+
 
 @router.message(~Command("add", "start", "list", "done", "remind", "reminders", "unremind"))
 async def handle_text(message: Message):
-    tasks = create_tasks(message.from_user.id, message.text)
+    tasks = await create_tasks(message.from_user.id, message.text)
 
     if not tasks:
         await message.answer(messages.NO_TASKS_FOUND)
@@ -28,7 +71,7 @@ async def add_task_handler(message: types.Message):
         await message.answer(messages.ADD_USAGE)
         return
 
-    tasks = create_tasks(message.from_user.id, text)
+    tasks = await create_tasks(message.from_user.id, text)
     if not tasks:
         await message.answer(messages.NO_TASKS_FOUND)
         return
@@ -38,65 +81,84 @@ async def add_task_handler(message: types.Message):
 
 @router.message(Command("list"))
 async def list_tasks_handler(message: types.Message):
-    tasks = list_tasks(message.from_user.id)
+    page = await list_tasks_page(message.from_user.id)
 
-    if not tasks:
+    if not page.records:
         await message.answer(messages.NO_TASKS)
         return
 
-    result = messages.LIST_HEADER
-    for i, record in enumerate(tasks, start=1):
-        line = record.task.title
-        if record.task.due_date:
-            line += f" — до {record.task.due_date.isoformat()}"
-        result += f"{i}. {line}\n"
+    await message.answer(_render_list(page, 0), reply_markup=_list_markup(page, 0))
+
+
+@router.callback_query(F.data.startswith("list_page:"))
+async def list_page_callback(callback: CallbackQuery):
+    cursor = parse_cursor(callback.data)
+    if cursor is None:
+        await callback.answer()
+        return
+
+    page = await list_tasks_page(callback.from_user.id, cursor.after_id, cursor.before_id)
+    if not page.records:
+        await callback.message.edit_text(messages.NO_TASKS)
+        await callback.answer()
+        return
 
-    await message.answer(result)
+    await callback.message.edit_text(
+        _render_list(page, cursor.offset),
+        reply_markup=_list_markup(page, cursor.offset),
+    )
+    await callback.answer()
 
 
 @router.message(Command("done"))
 async def done_task_handler(message: types.Message):
     parts = message.text.split()
-    tasks = list_tasks(message.from_user.id)
-
-    if not tasks:
-        await message.answer(messages.NO_TASKS)
-        return
 
     if len(parts) != 2 or not parts[1].isdigit():
-        builder = InlineKeyboardBuilder()
-        for i in range(len(tasks)):
-            builder.add(
-                InlineKeyboardButton(
-                    text=str(i + 1),
-                    callback_data=f"done:{i+1}",
-                )
-            )
-        builder.adjust(3)
-        await message.answer(messages.DONE_PROMPT, reply_markup=builder.as_markup())
+        page = await list_tasks_page(message.from_user.id)
+        if not page.records:
+            await message.answer(messages.NO_TASKS)
+            return
+
+        await message.answer(messages.DONE_PROMPT, reply_markup=_done_markup(page, 0))
         return
 
     index = int(parts[1]) - 1
-    record = delete_task_by_index(message.from_user.id, index)
+    record = await delete_task_by_index(message.from_user.id, index)
     if not record:
         await message.answer(messages.INVALID_INDEX)
         return
 
-    delete_by_task(message.from_user.id, record.id)
     await message.answer(messages.DONE_CONFIRMED)
 
 
+@router.callback_query(F.data.startswith("done_page:"))
+async def done_page_callback(callback: CallbackQuery):
+    cursor = parse_cursor(callback.data)
+    if cursor is None:
+        await callback.answer()
+        return
+
+    page = await list_tasks_page(callback.from_user.id, cursor.after_id, cursor.before_id)
+    if not page.records:
+        await callback.message.edit_text(messages.NO_TASKS)
+        await callback.answer()
+        return
+
+    await callback.message.edit_reply_markup(reply_markup=_done_markup(page, cursor.offset))
+    await callback.answer()
+
+
 @router.callback_query(F.data.startswith("done:"))
 async def process_done(callback: CallbackQuery):
     parts = callback.data.split(":")
     if len(parts) == 2 and parts[1].isdigit():
-        index = int(parts[1]) - 1
-        record = delete_task_by_index(callback.from_user.id, index)
+        task_id = int(parts[1])
+        record = await delete_task_by_id(callback.from_user.id, task_id)
         if not record:
             await callback.answer(messages.INVALID_INDEX, show_alert=True)
             return
 
-        delete_by_task(callback.from_user.id, record.id)
         await callback.message.edit_text(messages.DONE_CONFIRMED)
         await callback.answer()
 
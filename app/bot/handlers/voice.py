@@ -1,6 +1,4 @@
-﻿from dataclasses import dataclass
-import logging
-from pathlib import Path
+﻿import logging
 import time
 import uuid
 
@@ -8,51 +6,22 @@ from aiogram import Router, F
 from aiogram.types import CallbackQuery, InlineKeyboardButton, Message
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from app.asr.whisper_asr import transcribe
+from app.asr.service import TranscriptionDisabled, TranscriptionQueueFull, transcriber
+from app.asr.vad import detect_speech
+from app.asr.whisper_asr import STAGE_SECONDS, decode_ogg
 from app.bot import messages
 from app.llm.task_extractor import extract_tasks
 from app.schemas.task import Task, TaskRecord
-from app.services.tasks import create_tasks
+from app.schemas.voice import PendingVoice
+from app.services.pending_voice import pending_store
+from app.services.tasks import save_tasks
+from app.services.transcripts import audio_key, cache_transcript, get_cached_transcript, voice_key
 
 router = Router()
 
-AUDIO_DIR = Path("data/audio")
-AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-
-PENDING_TTL_SECONDS = 15 * 60
-_pending: dict[str, "PendingVoice"] = {}
 logger = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
-class PendingVoice:
-    user_id: int
-    text: str
-    created_at: float
-    ogg_path: Path
-
-
-def _cleanup_pending() -> None:
-    now = time.time()
-    expired = [
-        request_id
-        for request_id, pending in _pending.items()
-        if now - pending.created_at > PENDING_TTL_SECONDS
-    ]
-    for request_id in expired:
-        pending = _pending.pop(request_id, None)
-        if pending:
-            _delete_audio_file(pending.ogg_path)
-
-
-def _delete_audio_file(path: Path) -> None:
-    try:
-        if path.exists():
-            path.unlink()
-    except OSError:
-        logger.exception("Failed to delete audio file: %s", path)
-
-
 def _format_tasks(items: list[Task]) -> str:
     lines = []
     for i, task in enumerate(items, 1):
@@ -65,42 +34,80 @@ def _format_records(records: list[TaskRecord]) -> str:
     return _format_tasks([record.task for record in records])
 
 
-@router.message(F.voice)
-async def handle_voice(message: Message):
-    file = await message.bot.get_file(message.voice.file_id)
-
-    filename = f"{uuid.uuid4()}.ogg"
-    ogg_path = AUDIO_DIR / filename
+async def _transcribe_voice(message: Message) -> str:
+    # Forwarded and re-sent clips keep their file_unique_id; identical audio
+    # uploaded again is caught by the content hash after download.
+    unique_key = voice_key(message.voice.file_unique_id)
+    text = await get_cached_transcript(unique_key)
+    if text is not None:
+        return text
+    if not transcriber.running:
+        raise TranscriptionDisabled()
+
+    with STAGE_SECONDS.time(stage="download"):
+        file = await message.bot.get_file(message.voice.file_id)
+        ogg_data = (await message.bot.download_file(file.file_path)).getvalue()
+    content_key = audio_key(ogg_data)
+    text = await get_cached_transcript(content_key)
+    if text is not None:
+        await cache_transcript([unique_key], text)
+        return text
 
-    await message.bot.download_file(file.file_path, destination=ogg_path)
     await message.answer(messages.VOICE_PROCESSING)
+    audio = await decode_ogg(ogg_data)
+    with STAGE_SECONDS.time(stage="vad"):
+        speech = detect_speech(audio)
+    logger.info(
+        "VAD kept %.1fs of %.1fs audio (saved %.1fs) in %s segments%s",
+        speech.speech_seconds,
+        speech.total_seconds,
+        speech.saved_seconds,
+        len(speech.segments),
+        ", no speech found, sending the whole clip" if speech.fallback else "",
+    )
+    if not speech.segments:
+        # Nothing was sent to Whisper, so there is no transcript to cache.
+        return ""
+
+    texts = await transcriber.transcribe_segments(message.from_user.id, speech.segments)
+    text = " ".join(part for part in texts if part)
+    await cache_transcript([unique_key, content_key], text)
+    return text
+
 
+@router.message(F.voice)
+async def handle_voice(message: Message):
     try:
-        text = transcribe(ogg_path)
+        text = await _transcribe_voice(message)
+    except TranscriptionQueueFull:
+        await message.answer(messages.VOICE_BUSY)
+        return
+    except TranscriptionDisabled:
+        await message.answer(messages.VOICE_DISABLED)
+        return
     except Exception:
         logger.exception("Voice transcribe failed")
-        _delete_audio_file(ogg_path)
         await message.answer(messages.VOICE_TRANSCRIBE_ERROR)
         return
 
     if not text:
-        _delete_audio_file(ogg_path)
         await message.answer(messages.NO_TASKS_FOUND)
         return
 
     tasks = extract_tasks(text)
     if not tasks:
-        _delete_audio_file(ogg_path)
         await message.answer(messages.NO_TASKS_FOUND)
         return
 
-    _cleanup_pending()
     request_id = uuid.uuid4().hex
-    _pending[request_id] = PendingVoice(
-        user_id=message.from_user.id,
-        text=text,
-        created_at=time.time(),
-        ogg_path=ogg_path,
+    await pending_store.add(
+        request_id,
+        PendingVoice(
+            user_id=message.from_user.id,
+            text=text,
+            created_at=time.time(),
+            tasks=tuple(tasks),
+        ),
     )
 
     preview = "\n".join(
@@ -134,8 +141,7 @@ async def handle_voice(message: Message):
 @router.callback_query(F.data.startswith("confirm:"))
 async def confirm_voice(callback: CallbackQuery):
     request_id = callback.data.split(":", maxsplit=1)[1]
-    _cleanup_pending()
-    pending = _pending.get(request_id)
+    pending = await pending_store.get(request_id)
     if not pending:
         await callback.answer(messages.VOICE_EXPIRED, show_alert=True)
         return
@@ -144,10 +150,12 @@ async def confirm_voice(callback: CallbackQuery):
         await callback.answer(messages.VOICE_NOT_ALLOWED, show_alert=True)
         return
 
-    _pending.pop(request_id, None)
-    records = create_tasks(pending.user_id, pending.text)
+    if await pending_store.pop(request_id) is None:
+        await callback.answer(messages.VOICE_EXPIRED, show_alert=True)
+        return
+
+    records = await save_tasks(pending.user_id, list(pending.tasks))
     if not records:
-        _delete_audio_file(pending.ogg_path)
         await callback.message.edit_text(messages.NO_TASKS_FOUND)
         await callback.answer()
         return
@@ -159,14 +167,12 @@ async def confirm_voice(callback: CallbackQuery):
 
     await callback.message.edit_text(reply)
     await callback.answer()
-    _delete_audio_file(pending.ogg_path)
 
 
 @router.callback_query(F.data.startswith("cancel:"))
 async def cancel_voice(callback: CallbackQuery):
     request_id = callback.data.split(":", maxsplit=1)[1]
-    _cleanup_pending()
-    pending = _pending.get(request_id)
+    pending = await pending_store.get(request_id)
     if not pending:
         await callback.answer(messages.VOICE_EXPIRED, show_alert=True)
         return
@@ -175,7 +181,6 @@ async def cancel_voice(callback: CallbackQuery):
         await callback.answer(messages.VOICE_NOT_ALLOWED, show_alert=True)
         return
 
-    _pending.pop(request_id, None)
-    _delete_audio_file(pending.ogg_path)
+    await pending_store.pop(request_id)
     await callback.message.edit_text(messages.VOICE_CANCELLED)
     await callback.answer()
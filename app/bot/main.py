@@ -1,20 +1,59 @@
 import asyncio
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.client.session.aiohttp import AiohttpSession
+from app.asr.service import transcriber
 from app.bot.handlers.voice import router as voice_router
 from app.bot.handlers.reminders import router as reminders_router
 from app.bot.handlers.text import router as text_router
-from app.config import BOT_TOKEN
+from app.bot.middlewares import setup_metrics
+from app.bot.storage import create_storage
+from app.config import BOT_HTTP_POOL_SIZE, BOT_TOKEN, FSM_STORAGE, METRICS_DUMP_SECONDS, METRICS_FILE
+from app.services.pending_voice import pending_store, pending_sweeper
 from app.services.reminders import reminder_worker
+from app.utils.metrics import metrics_dumper
 
 
-async def register_handlers():
-    bot = Bot(token=BOT_TOKEN)
-    dp = Dispatcher(storage=MemoryStorage())
+def create_bot() -> Bot:
+    # One aiohttp session (and connection pool) for every outgoing API call.
+    return Bot(token=BOT_TOKEN, session=AiohttpSession(limit=BOT_HTTP_POOL_SIZE))
+
+
+def create_dispatcher() -> Dispatcher:
+    dp = Dispatcher(storage=create_storage(FSM_STORAGE))
 
     dp.include_router(voice_router)
     dp.include_router(reminders_router)
     dp.include_router(text_router)
+    setup_metrics(dp)
+    return dp
+
+
+async def start_services(bot: Bot, reminder_poll: float | None = None) -> list[asyncio.Task]:
+    await transcriber.start()
+    await pending_store.load()
+    tasks = [
+        asyncio.create_task(reminder_worker(bot, reminder_poll)),
+        asyncio.create_task(pending_sweeper(pending_store)),
+    ]
+    if METRICS_FILE:
+        tasks.append(asyncio.create_task(metrics_dumper(METRICS_FILE, METRICS_DUMP_SECONDS)))
+    return tasks
+
+
+async def stop_services(bot: Bot, tasks: list[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await transcriber.stop()
+    await bot.session.close()
+
+
+async def register_handlers():
+    bot = create_bot()
+    dp = create_dispatcher()
 
-    asyncio.create_task(reminder_worker(bot))
-    await dp.start_polling(bot)
+    tasks = await start_services(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        await stop_services(bot, tasks)
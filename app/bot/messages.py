@@ -18,6 +18,8 @@ START_TEXT = (
 
 VOICE_PROCESSING = "Processing voice message..."
 VOICE_TRANSCRIBE_ERROR = "Sorry, I could not process that voice message."
+VOICE_DISABLED = "Voice messages are not supported right now. Please send the tasks as text."
+VOICE_BUSY = "Too many voice messages are being processed right now. Please try again in a minute."
 VOICE_PREVIEW_HEADER = "Recognized text:"
 VOICE_TASKS_HEADER = "Tasks:"
 VOICE_CONFIRM_BUTTON = "Add"
@@ -35,3 +37,6 @@ REMIND_NOTIFICATION = "⏰ Напоминание: {text}"
 REMIND_LIST_HEADER = "Напоминания:"
 REMIND_LIST_EMPTY = "Напоминаний нет."
 REMIND_DELETED = "Напоминание удалено."
+
+PAGE_PREV_BUTTON = "◀️ Назад"
+PAGE_NEXT_BUTTON = "Вперёд ▶️"
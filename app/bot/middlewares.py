@@ -0,0 +1,38 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject
+
+from app.utils.metrics import counter, histogram
+
+HANDLER_SECONDS = histogram("bot_handler_seconds", "Time spent in update handlers.", ("handler",))
+HANDLER_ERRORS = counter("bot_handler_errors_total", "Handlers that raised an exception.", ("handler",))
+
+
+class HandlerTimingMiddleware(BaseMiddleware):
+    """Records the latency of every matched handler, labelled module.function."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        callback = data["handler"].callback
+        name = f"{callback.__module__.rsplit('.', 1)[-1]}.{callback.__name__}"
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.inc(handler=name)
+            raise
+        finally:
+            HANDLER_SECONDS.observe(time.perf_counter() - started, handler=name)
+
+
+def setup_metrics(dp: Dispatcher) -> None:
+    # Inner middlewares of the dispatcher also run for handlers of included routers.
+    timing = HandlerTimingMiddleware()
+    dp.message.middleware(timing)
+    dp.callback_query.middleware(timing)
@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+
+from aiogram.types import InlineKeyboardButton
+
+from app.bot import messages
+from app.schemas.task import TaskPage
+from app.services.tasks import PAGE_SIZE
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    after_id: int = 0
+    before_id: int | None = None
+    offset: int = 0
+
+
+def parse_cursor(data: str) -> PageCursor | None:
+    # <prefix>:n:<last_id>:<offset> or <prefix>:p:<first_id>:<offset>
+    parts = data.split(":")
+    if len(parts) != 4 or parts[1] not in ("n", "p"):
+        return None
+    if not (parts[2].isdigit() and parts[3].isdigit()):
+        return None
+
+    cursor_id, offset = int(parts[2]), int(parts[3])
+    if parts[1] == "n":
+        return PageCursor(after_id=cursor_id, offset=offset)
+    return PageCursor(before_id=cursor_id, offset=offset)
+
+
+def nav_buttons(prefix: str, page: TaskPage, offset: int) -> list[InlineKeyboardButton]:
+    buttons: list[InlineKeyboardButton] = []
+    if not page.records:
+        return buttons
+
+    if page.has_prev:
+        buttons.append(
+            InlineKeyboardButton(
+                text=messages.PAGE_PREV_BUTTON,
+                callback_data=f"{prefix}:p:{page.records[0].id}:{max(offset - PAGE_SIZE, 0)}",
+            )
+        )
+    if page.has_next:
+        buttons.append(
+            InlineKeyboardButton(
+                text=messages.PAGE_NEXT_BUTTON,
+                callback_data=f"{prefix}:n:{page.records[-1].id}:{offset + len(page.records)}",
+            )
+        )
+    return buttons
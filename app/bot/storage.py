@@ -0,0 +1,45 @@
+import json
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.db.database import run_read, run_write
+from app.db.fsm_repo import get_fsm_data, get_fsm_state, set_fsm_data, set_fsm_state
+
+
+class SQLiteStorage(BaseStorage):
+    """FSM storage in the bot database, shared by every bot process."""
+
+    def __init__(self, key_builder: KeyBuilder | None = None) -> None:
+        self.key_builder = key_builder or DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        value = state.state if isinstance(state, State) else state
+        await run_write(set_fsm_state, self.key_builder.build(key), value)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return await run_read(get_fsm_state, self.key_builder.build(key))
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await run_write(set_fsm_data, self.key_builder.build(key), json.dumps(dict(data), ensure_ascii=False))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return json.loads(await run_read(get_fsm_data, self.key_builder.build(key)))
+
+    async def close(self) -> None:
+        pass
+
+
+STORAGES = {
+    "memory": MemoryStorage,
+    "sqlite": SQLiteStorage,
+}
+
+
+def create_storage(name: str) -> BaseStorage:
+    try:
+        return STORAGES[name]()
+    except KeyError:
+        raise RuntimeError(f"Unknown FSM storage: {name}") from None
@@ -0,0 +1,149 @@
+"""Webhook mode: Telegram pushes updates to an aiohttp server.
+
+The supervisor registers the webhook once and starts WEBHOOK_WORKERS server
+processes. With more than one worker they share the port through
+SO_REUSEPORT and the kernel spreads Telegram's parallel connections
+(up to WEBHOOK_MAX_CONNECTIONS) across them.
+"""
+import asyncio
+import logging
+import multiprocessing
+import secrets
+import signal
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from app.bot.main import create_bot, create_dispatcher, start_services, stop_services
+from app.config import (
+    METRICS_PATH,
+    REMINDER_POLL_SECONDS,
+    WEBHOOK_BASE_URL,
+    WEBHOOK_HOST,
+    WEBHOOK_MAX_CONNECTIONS,
+    WEBHOOK_PATH,
+    WEBHOOK_PORT,
+    WEBHOOK_SECRET,
+    WEBHOOK_WORKERS,
+)
+from app.db.database import close_db
+from app.services.cache import task_cache
+from app.utils.metrics import render
+
+logger = logging.getLogger(__name__)
+
+
+def webhook_url() -> str:
+    return WEBHOOK_BASE_URL.rstrip("/") + WEBHOOK_PATH
+
+
+async def metrics_handler(request: web.Request) -> web.Response:
+    return web.Response(
+        body=render().encode("utf-8"),
+        headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+    )
+
+
+def build_app(dp: Dispatcher, bot: Bot, secret: str, metrics: bool = True) -> web.Application:
+    app = web.Application()
+    # Requests without the matching X-Telegram-Bot-Api-Secret-Token header get 401.
+    SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=secret).register(app, path=WEBHOOK_PATH)
+    if metrics and METRICS_PATH:
+        app.router.add_get(METRICS_PATH, metrics_handler)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def register_webhook(secret: str, allowed_updates: list[str]) -> None:
+    bot = create_bot()
+    try:
+        await bot.set_webhook(
+            webhook_url(),
+            secret_token=secret,
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+            allowed_updates=allowed_updates,
+        )
+    finally:
+        await bot.session.close()
+
+
+async def serve(index: int, secret: str, workers: int, dp: Dispatcher | None = None) -> None:
+    if workers > 1:
+        # Cached task lists are only invalidated inside the process that
+        # changed them, so with several workers every read goes to SQLite.
+        task_cache.maxsize = 0
+
+    bot = create_bot()
+    if dp is None:
+        dp = create_dispatcher()
+    # Every worker runs the reminder loop; a lease picks the one that sends,
+    # and polling lets it see reminders created by the other workers.
+    tasks = await start_services(bot, REMINDER_POLL_SECONDS if workers > 1 else None)
+
+    # Workers sharing the port through SO_REUSEPORT would each answer a
+    # scrape with their own counters, picked at random by the kernel, so
+    # they leave /metrics out and are read through METRICS_FILE instead.
+    if workers > 1 and METRICS_PATH and index == 0:
+        logger.info("%s is disabled with %s webhook workers; set METRICS_FILE", METRICS_PATH, workers)
+    runner = web.AppRunner(build_app(dp, bot, secret, metrics=workers <= 1))
+    await runner.setup()
+    site = web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT, reuse_port=workers > 1)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+    except NotImplementedError:
+        pass
+
+    try:
+        await site.start()
+        logger.info("Webhook worker %s listening on %s:%s%s", index, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_PATH)
+        await stop.wait()
+    finally:
+        await runner.cleanup()
+        await stop_services(bot, tasks)
+        close_db()
+
+
+def _worker_main(index: int, secret: str, workers: int, dp: Dispatcher | None = None) -> None:
+    try:
+        asyncio.run(serve(index, secret, workers, dp))
+    except KeyboardInterrupt:
+        pass
+
+
+def run() -> None:
+    # Every worker must check the same secret, so a generated one is made
+    # here and handed to the workers.
+    secret = WEBHOOK_SECRET or secrets.token_urlsafe(32)
+    # Routers can be attached to only one dispatcher per process, so the
+    # one built here to resolve the update types is also the one served
+    # when there are no worker processes; spawned workers build their own.
+    dp = create_dispatcher()
+    asyncio.run(register_webhook(secret, dp.resolve_used_update_types()))
+
+    if WEBHOOK_WORKERS <= 1:
+        _worker_main(0, secret, 1, dp)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_worker_main,
+            args=(index, secret, WEBHOOK_WORKERS),
+            name=f"webhook-{index}",
+        )
+        for index in range(WEBHOOK_WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
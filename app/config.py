@@ -7,3 +7,44 @@ BOT_TOKEN = os.getenv("BOT_TOKEN")
 
 if not BOT_TOKEN:
     raise RuntimeError("BOT_TOKEN не найден в .env")
+
+ASR_WORKERS = int(os.getenv("ASR_WORKERS", "1"))
+ASR_MAX_PENDING = int(os.getenv("ASR_MAX_PENDING", "32"))
+ASR_MAX_PENDING_PER_USER = int(os.getenv("ASR_MAX_PENDING_PER_USER", "3"))
+ASR_BATCH_SIZE = int(os.getenv("ASR_BATCH_SIZE", "8"))
+ASR_BATCH_WAIT_MS = int(os.getenv("ASR_BATCH_WAIT_MS", "30"))
+
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "whisper")
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "tiny")
+WHISPER_THREADS = int(os.getenv("WHISPER_THREADS", "0"))
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+
+PENDING_PERSIST = os.getenv("PENDING_PERSIST", "1") == "1"
+
+FSM_STORAGE = os.getenv("FSM_STORAGE", "sqlite")
+REMINDER_POLL_SECONDS = float(os.getenv("REMINDER_POLL_SECONDS", "5"))
+
+METRICS_PATH = os.getenv("METRICS_PATH", "/metrics")
+METRICS_FILE = os.getenv("METRICS_FILE", "")
+METRICS_DUMP_SECONDS = float(os.getenv("METRICS_DUMP_SECONDS", "15"))
+
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", str(os.cpu_count() or 1)))
+SHARD_CONCURRENCY = int(os.getenv("SHARD_CONCURRENCY", "64"))
+SHARD_ASR_WORKERS = int(os.getenv("SHARD_ASR_WORKERS", "1"))
+
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+BOT_HTTP_POOL_SIZE = int(os.getenv("BOT_HTTP_POOL_SIZE", "100"))
+
+WEBHOOK_BASE_URL = os.getenv("WEBHOOK_BASE_URL", "")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "1"))
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))
+
+if BOT_MODE not in ("polling", "webhook"):
+    raise RuntimeError("BOT_MODE должен быть polling или webhook")
+
+if BOT_MODE == "webhook" and not WEBHOOK_BASE_URL:
+    raise RuntimeError("WEBHOOK_BASE_URL не задан для BOT_MODE=webhook")
@@ -1,21 +1,289 @@
-from datetime import date, timedelta
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import date, time, timedelta
 import re
+from typing import Callable, Iterable
 
+_RELATIVE_DAYS = {
+    "сегодня": timedelta(days=0),
+    "завтра": timedelta(days=1),
+    "послезавтра": timedelta(days=2),
+}
 
-def parse_date(text: str) -> date | None:
-    text = text.lower()
-    today = date.today()
+_WEEKDAYS = {
+    "понедельник": 0,
+    "вторник": 1,
+    "среду": 2,
+    "четверг": 3,
+    "пятницу": 4,
+    "субботу": 5,
+    "воскресенье": 6,
+}
 
-    if "сегодня" in text:
-        return today
-    if "послезавтра" in text:
-        return today + timedelta(days=2)
-    if "завтра" in text:
-        return today + timedelta(days=1)
+# Keyed by the first three letters of the genitive form ("мая" and "май"
+# both start differently from "мар", so three letters are unambiguous).
+_MONTHS = {
+    "янв": 1,
+    "фев": 2,
+    "мар": 3,
+    "апр": 4,
+    "мая": 5,
+    "май": 5,
+    "июн": 6,
+    "июл": 7,
+    "авг": 8,
+    "сен": 9,
+    "окт": 10,
+    "ноя": 11,
+    "дек": 12,
+}
 
-    m = re.search(r"(\d{1,2})[./](\d{1,2})", text)
-    if m:
-        day, month = map(int, m.groups())
-        return date(today.year, month, day)
+_COUNT_WORDS = {
+    "один": 1,
+    "одну": 1,
+    "два": 2,
+    "две": 2,
+    "три": 3,
+    "четыре": 4,
+    "пять": 5,
+    "шесть": 6,
+    "семь": 7,
+    "десять": 10,
+}
 
+_MONTH_NAMES = (
+    r"январ[яь]|феврал[яь]|марта?|апрел[яь]|ма[яй]|июн[яь]|июл[яь]|августа?"
+    r"|сентябр[яь]|октябр[яь]|ноябр[яь]|декабр[яь]"
+)
+
+
+@dataclass(frozen=True)
+class DateRule:
+    """One alternative of the date grammar.
+
+    ``pattern`` is matched against lowercased text and may only use named
+    groups prefixed with ``name``. ``hints`` lists substrings one of which
+    occurs in every match, and ``needs_digit`` marks rules whose matches
+    always contain a digit; a rule only runs on text that passes both.
+    """
+
+    name: str
+    pattern: str
+    resolve: Callable[[re.Match, date], date | time | None]
+    hints: tuple[str, ...] = ()
+    needs_digit: bool = False
+
+
+def _safe_date(year: int, month: int, day: int) -> date | None:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _full_year(value: str) -> int:
+    year = int(value)
+    return year + 2000 if year < 100 else year
+
+
+def _calendar_date(year: str | None, month: int, day: int, today: date) -> date | None:
+    if year is not None:
+        return _safe_date(_full_year(year), month, day)
+    # Without a year the date is the next one from today on, the way
+    # weekdays roll forward: "12 мая" written in October means next May.
+    for candidate_year in (today.year, today.year + 1):
+        value = _safe_date(candidate_year, month, day)
+        if value is not None and value >= today:
+            return value
     return None
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(value.day, monthrange(year, month)[1]))
+
+
+def _resolve_relative(match: re.Match, today: date) -> date:
+    return today + _RELATIVE_DAYS[match.group("relative_word")]
+
+
+def _resolve_weekday(match: re.Match, today: date) -> date:
+    days_ahead = (_WEEKDAYS[match.group("weekday_name")] - today.weekday()) % 7
+    return today + timedelta(days=days_ahead or 7)
+
+
+def _resolve_offset(match: re.Match, today: date) -> date | None:
+    count = match.group("offset_count")
+    if count is None:
+        amount = 1
+    else:
+        amount = _COUNT_WORDS.get(count) or int(count)
+
+    unit = match.group("offset_unit")
+    try:
+        if unit.startswith("д"):
+            return today + timedelta(days=amount)
+        if unit.startswith("н"):
+            return today + timedelta(weeks=amount)
+        return _add_months(today, amount)
+    except (OverflowError, ValueError):
+        return None
+
+
+def _resolve_named(match: re.Match, today: date) -> date | None:
+    return _calendar_date(
+        match.group("named_year"),
+        _MONTHS[match.group("named_month")[:3]],
+        int(match.group("named_day")),
+        today,
+    )
+
+
+def _resolve_numeric(match: re.Match, today: date) -> date | None:
+    return _calendar_date(
+        match.group("numeric_year"),
+        int(match.group("numeric_month")),
+        int(match.group("numeric_day")),
+        today,
+    )
+
+
+def _resolve_time(match: re.Match, today: date) -> time | None:
+    hour, minute = int(match.group("time_hour")), int(match.group("time_minute"))
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+
+RULES: tuple[DateRule, ...] = (
+    DateRule(
+        name="relative",
+        pattern=r"\b(?P<relative_word>сегодня|послезавтра|завтра)\b",
+        resolve=_resolve_relative,
+        hints=("сегодня", "завтра"),
+    ),
+    DateRule(
+        name="weekday",
+        pattern=rf"\bво?\s+(?P<weekday_name>{'|'.join(_WEEKDAYS)})\b",
+        resolve=_resolve_weekday,
+        hints=tuple(_WEEKDAYS),
+    ),
+    DateRule(
+        name="offset",
+        pattern=(
+            rf"\bчерез\s+(?:(?P<offset_count>\d{{1,3}}|{'|'.join(_COUNT_WORDS)})\s+)?"
+            r"(?P<offset_unit>дней|дня|день|недел[юиь]|месяц(?:а|ев)?)\b"
+        ),
+        resolve=_resolve_offset,
+        hints=("через",),
+    ),
+    DateRule(
+        name="named",
+        pattern=(
+            rf"\b(?P<named_day>\d{{1,2}})\s+(?P<named_month>{_MONTH_NAMES})"
+            r"(?:\s+(?P<named_year>\d{4})(?:\s+года?)?)?\b"
+        ),
+        resolve=_resolve_named,
+        needs_digit=True,
+    ),
+    DateRule(
+        name="numeric",
+        pattern=(
+            r"\b(?P<numeric_day>\d{1,2})[./](?P<numeric_month>\d{1,2})"
+            r"(?:[./](?P<numeric_year>\d{4}|\d{2}))?\b"
+        ),
+        resolve=_resolve_numeric,
+        hints=(".", "/"),
+        needs_digit=True,
+    ),
+    DateRule(
+        name="time",
+        pattern=r"(?:\b[вк]\s+)?\b(?P<time_hour>\d{1,2}):(?P<time_minute>\d{2})\b",
+        resolve=_resolve_time,
+        hints=(":",),
+        needs_digit=True,
+    ),
+)
+
+_RULES_BY_NAME = {rule.name: rule for rule in RULES}
+
+
+def _alternation(rules: Iterable[DateRule]) -> re.Pattern:
+    # Each rule is wrapped in a group named after it; that group closes
+    # last, so ``match.lastgroup`` names the rule.
+    return re.compile("|".join(f"(?P<{rule.name}>{rule.pattern})" for rule in rules))
+
+
+# The whole table as one alternation.
+DATE_PATTERN = _alternation(RULES)
+
+# Plain substring checks are far cheaper than running the pattern, and most
+# messages have no date at all. They also pick the rules worth trying:
+# bit i of a mask stands for RULES[i], and each mask gets its own, shorter
+# alternation, since the regex engine tries every branch at every position.
+def _hint_bits(rules: Iterable[DateRule]) -> dict[str, int]:
+    bits: dict[str, int] = {}
+    for index, rule in enumerate(rules):
+        for hint in rule.hints:
+            bits[hint] = bits.get(hint, 0) | 1 << index
+    return bits
+
+
+_HINT_BITS = _hint_bits(RULES)
+# One scan finds every hint; no hint overlaps another, so findall, which
+# skips overlapping hits, misses none.
+_HINT_PATTERN = re.compile("|".join(map(re.escape, _HINT_BITS)))
+_UNHINTED = sum(1 << index for index, rule in enumerate(RULES) if not rule.hints)
+_NEEDS_DIGIT = sum(1 << index for index, rule in enumerate(RULES) if rule.needs_digit)
+_DIGIT = re.compile(r"\d")
+_PATTERNS: dict[int, re.Pattern] = {}
+
+
+def _rule_mask(lowered: str) -> int:
+    mask = _UNHINTED
+    for hint in _HINT_PATTERN.findall(lowered):
+        mask |= _HINT_BITS[hint]
+    if mask & _NEEDS_DIGIT and _DIGIT.search(lowered) is None:
+        mask &= ~_NEEDS_DIGIT
+    return mask
+
+
+def date_matches(lowered: str) -> list[re.Match]:
+    """DATE_PATTERN matches in lowercased text, trying only the hinted rules."""
+    mask = _rule_mask(lowered)
+    if not mask:
+        return []
+    pattern = _PATTERNS.get(mask)
+    if pattern is None:
+        pattern = _PATTERNS[mask] = _alternation(rule for index, rule in enumerate(RULES) if mask >> index & 1)
+    return list(pattern.finditer(lowered))
+
+
+def resolve_matches(matches: Iterable[re.Match], today: date) -> tuple[date | None, time | None]:
+    """Fold DATE_PATTERN matches into a due date and an optional time.
+
+    The first date wins; a time without any date means today.
+    """
+    due: date | None = None
+    at: time | None = None
+    for match in matches:
+        value = _RULES_BY_NAME[match.lastgroup].resolve(match, today)
+        if isinstance(value, time):
+            at = at or value
+        elif due is None:
+            due = value
+    if due is None and at is not None:
+        due = today
+    return due, at
+
+
+def parse_date_time(text: str, today: date | None = None) -> tuple[date | None, time | None]:
+    matches = date_matches(text.lower())
+    if not matches:
+        return None, None
+    return resolve_matches(matches, today or date.today())
+
+
+def parse_date(text: str, today: date | None = None) -> date | None:
+    return parse_date_time(text, today)[0]
@@ -1,23 +1,184 @@
+import asyncio
+import functools
+import queue
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+from app.utils.metrics import histogram
+
+T = TypeVar("T")
 
 DB_PATH = Path("data/todo.db")
 
-def get_connection():
-    DB_PATH.parent.mkdir(exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+POOL_SIZE = 4
+POOL_TIMEOUT_SECONDS = 10.0
+STATEMENT_CACHE_SIZE = 256
 
-def init_db():
-    with get_connection() as conn:
-        conn.execute("""
+# Repository functions are decorated with timed(QUERY_SECONDS, repo=...).
+QUERY_SECONDS = histogram("bot_db_query_seconds", "Time spent in repository functions.", ("repo", "query"))
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 134217728",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+class ConnectionPool:
+    def __init__(self, path: Path, size: int = POOL_SIZE) -> None:
+        self.path = path
+        self.size = size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._open()
+                except Exception:
+                    self._opened -= 1
+                    raise
+
+        try:
+            return self._idle.get(timeout=POOL_TIMEOUT_SECONDS)
+        except queue.Empty:
+            raise RuntimeError("Timed out waiting for a database connection") from None
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+            return
+        self._idle.put_nowait(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+# One writer thread serialises all writes (SQLite allows a single writer anyway),
+# the remaining pool connections serve concurrent readers.
+_write_executor: ThreadPoolExecutor | None = None
+_read_executor: ThreadPoolExecutor | None = None
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+
+@contextmanager
+def get_connection() -> Iterator[sqlite3.Connection]:
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        with conn:
+            yield conn
+    finally:
+        pool.release(conn)
+
+
+def _get_executors() -> tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+    global _write_executor, _read_executor
+    if _write_executor is None or _read_executor is None:
+        with _pool_lock:
+            if _write_executor is None:
+                _write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+            if _read_executor is None:
+                _read_executor = ThreadPoolExecutor(
+                    max_workers=max(POOL_SIZE - 1, 1),
+                    thread_name_prefix="db-reader",
+                )
+    return _write_executor, _read_executor
+
+
+async def run_read(func: Callable[..., T], *args, **kwargs) -> T:
+    _, executor = _get_executors()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_write(func: Callable[..., T], *args, **kwargs) -> T:
+    executor, _ = _get_executors()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+def close_db() -> None:
+    global _pool, _write_executor, _read_executor
+    with _pool_lock:
+        executors = (_write_executor, _read_executor)
+        _write_executor = None
+        _read_executor = None
+
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+MIGRATIONS: list[tuple[int, tuple[str, ...]]] = [
+    (
+        1,
+        (
+            """
             CREATE TABLE IF NOT EXISTS tasks (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER NOT NULL,
                 text TEXT NOT NULL,
                 due_date DATE
             )
-        """)
-        conn.execute("""
+            """,
+            """
             CREATE TABLE IF NOT EXISTS reminders (
                 id INTEGER PRIMARY KEY,
                 user_id INTEGER NOT NULL,
@@ -28,8 +189,142 @@ def init_db():
                 created_at TEXT NOT NULL,
                 last_fired_at TEXT NULL
             )
-        """)
-        conn.execute("""
+            """,
+            """
             CREATE INDEX IF NOT EXISTS idx_reminders_user_next_active
             ON reminders (user_id, next_fire_at, is_active)
-        """)
+            """,
+        ),
+    ),
+    (
+        2,
+        (
+            """
+            CREATE INDEX IF NOT EXISTS idx_reminders_due
+            ON reminders (next_fire_at) WHERE is_active = 1
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_tasks_user_id
+            ON tasks (user_id, id)
+            """,
+        ),
+    ),
+    (
+        3,
+        (
+            """
+            CREATE TABLE IF NOT EXISTS transcriptions (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_transcriptions_last_used
+            ON transcriptions (last_used_at)
+            """,
+        ),
+    ),
+    (
+        4,
+        (
+            """
+            CREATE TABLE IF NOT EXISTS pending_voice (
+                request_id TEXT PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_pending_voice_created
+            ON pending_voice (created_at)
+            """,
+        ),
+    ),
+    (
+        5,
+        (
+            "ALTER TABLE pending_voice ADD COLUMN tasks TEXT NOT NULL DEFAULT '[]'",
+        ),
+    ),
+    (
+        6,
+        (
+            "ALTER TABLE reminders ADD COLUMN claimed_by TEXT NULL",
+            "ALTER TABLE reminders ADD COLUMN claim_until TEXT NULL",
+            """
+            CREATE TABLE IF NOT EXISTS fsm_state (
+                key TEXT PRIMARY KEY,
+                state TEXT NULL,
+                data TEXT NOT NULL DEFAULT '{}',
+                updated_at REAL NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """,
+        ),
+    ),
+]
+
+# Hot queries and the index each of them must use.
+HOT_QUERY_PLANS: tuple[tuple[str, tuple, str], ...] = (
+    (
+        """
+        SELECT id FROM reminders
+        WHERE is_active = 1 AND next_fire_at <= ?
+          AND (claim_until IS NULL OR claim_until <= ?)
+        LIMIT ?
+        """,
+        ("", "", 1),
+        "idx_reminders_due",
+    ),
+    (
+        "SELECT id, text, due_date FROM tasks WHERE user_id = ? ORDER BY id",
+        (0,),
+        "idx_tasks_user_id",
+    ),
+)
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    version = get_schema_version(conn)
+    conn.commit()
+    for target, statements in MIGRATIONS:
+        if target <= version:
+            continue
+        conn.execute("BEGIN")
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute("INSERT INTO schema_version (version) VALUES (?)", (target,))
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+        version = target
+    return version
+
+
+def check_query_plans(conn: sqlite3.Connection) -> None:
+    for sql, params, index in HOT_QUERY_PLANS:
+        plan = " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        if index not in plan:
+            raise RuntimeError(f"Query does not use {index}: {plan}")
+
+
+def init_db():
+    with get_connection() as conn:
+        migrate(conn)
+        check_query_plans(conn)
@@ -0,0 +1,51 @@
+import time
+
+from app.db.database import get_connection
+
+EMPTY_DATA = "{}"
+
+
+def get_fsm_state(key: str) -> str | None:
+    with get_connection() as conn:
+        row = conn.execute("SELECT state FROM fsm_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def get_fsm_data(key: str) -> str:
+    with get_connection() as conn:
+        row = conn.execute("SELECT data FROM fsm_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else EMPTY_DATA
+
+
+def _drop_if_empty(conn, key: str) -> None:
+    # A cleared conversation leaves nothing behind.
+    conn.execute(
+        "DELETE FROM fsm_state WHERE key = ? AND state IS NULL AND data = ?",
+        (key, EMPTY_DATA),
+    )
+
+
+def set_fsm_state(key: str, state: str | None) -> None:
+    with get_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO fsm_state (key, state, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE
+            SET state = excluded.state, updated_at = excluded.updated_at
+            """,
+            (key, state, time.time()),
+        )
+        _drop_if_empty(conn, key)
+
+
+def set_fsm_data(key: str, data: str) -> None:
+    with get_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO fsm_state (key, data, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE
+            SET data = excluded.data, updated_at = excluded.updated_at
+            """,
+            (key, data, time.time()),
+        )
+        _drop_if_empty(conn, key)
@@ -0,0 +1,25 @@
+import time
+
+from app.db.database import get_connection
+
+
+def acquire_lease(name: str, owner: str, ttl_seconds: float) -> bool:
+    """Take or renew the named lease; False while another owner holds it."""
+    now = time.time()
+    with get_connection() as conn:
+        row = conn.execute(
+            """
+            INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE
+            SET owner = excluded.owner, expires_at = excluded.expires_at
+            WHERE leases.owner = excluded.owner OR leases.expires_at <= ?
+            RETURNING owner
+            """,
+            (name, owner, now + ttl_seconds, now),
+        ).fetchone()
+    return row is not None
+
+
+def release_lease(name: str, owner: str) -> None:
+    with get_connection() as conn:
+        conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
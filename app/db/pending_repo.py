@@ -0,0 +1,98 @@
+import json
+from datetime import date
+
+from app.db.database import get_connection
+from app.schemas.task import Task
+from app.schemas.voice import PendingVoice
+
+
+def _serialize_tasks(tasks: tuple[Task, ...]) -> str:
+    return json.dumps(
+        [
+            {"title": task.title, "due_date": task.due_date.isoformat() if task.due_date else None}
+            for task in tasks
+        ],
+        ensure_ascii=False,
+    )
+
+
+def _deserialize_tasks(value: str) -> tuple[Task, ...]:
+    return tuple(
+        Task(
+            title=item["title"],
+            due_date=date.fromisoformat(item["due_date"]) if item["due_date"] else None,
+        )
+        for item in json.loads(value)
+    )
+
+
+def save_pending(request_id: str, pending: PendingVoice) -> None:
+    with get_connection() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO pending_voice (request_id, user_id, text, created_at, tasks)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                request_id,
+                pending.user_id,
+                pending.text,
+                pending.created_at,
+                _serialize_tasks(pending.tasks),
+            ),
+        )
+
+
+def _to_pending(row: tuple) -> PendingVoice:
+    user_id, text, created_at, tasks = row
+    return PendingVoice(
+        user_id=user_id,
+        text=text,
+        created_at=created_at,
+        tasks=_deserialize_tasks(tasks),
+    )
+
+
+def get_pending(request_id: str) -> PendingVoice | None:
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT user_id, text, created_at, tasks FROM pending_voice WHERE request_id = ?",
+            (request_id,),
+        ).fetchone()
+    return _to_pending(row) if row else None
+
+
+def take_pending(request_id: str) -> PendingVoice | None:
+    # Deleting and reading in one statement lets only one process claim a request.
+    with get_connection() as conn:
+        row = conn.execute(
+            """
+            DELETE FROM pending_voice WHERE request_id = ?
+            RETURNING user_id, text, created_at, tasks
+            """,
+            (request_id,),
+        ).fetchone()
+    return _to_pending(row) if row else None
+
+
+def delete_pending_before(created_before: float) -> None:
+    with get_connection() as conn:
+        conn.execute("DELETE FROM pending_voice WHERE created_at < ?", (created_before,))
+
+
+def load_pending(created_after: float, limit: int) -> list[tuple[str, PendingVoice]]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT request_id, user_id, text, created_at, tasks
+            FROM (
+                SELECT * FROM pending_voice
+                WHERE created_at >= ?
+                ORDER BY created_at DESC
+                LIMIT ?
+            )
+            ORDER BY created_at
+            """,
+            (created_after, limit),
+        ).fetchall()
+    return [(row[0], _to_pending(row[1:])) for row in rows]
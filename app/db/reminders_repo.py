@@ -1,11 +1,31 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import Iterable
 
-from app.db.database import get_connection
+from app.db.database import QUERY_SECONDS, get_connection
 from app.schemas.reminder import Reminder
+from app.utils.metrics import timed
 
+_timed = timed(QUERY_SECONDS, repo="reminders")
 
+_COLUMNS = "id, user_id, task_id, time_hhmm, next_fire_at, is_active, created_at, last_fired_at"
+
+
+def _to_reminder(row: tuple) -> Reminder:
+    return Reminder(
+        id=row[0],
+        user_id=row[1],
+        task_id=row[2],
+        time_hhmm=row[3],
+        next_fire_at=row[4],
+        is_active=row[5],
+        created_at=row[6],
+        last_fired_at=row[7],
+    )
+
+
+@_timed
 def create_reminder(user_id: int, task_id: int, time_hhmm: str, next_fire_at: str) -> int:
     created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
     with get_connection() as conn:
@@ -20,32 +40,72 @@ def create_reminder(user_id: int, task_id: int, time_hhmm: str, next_fire_at: st
         return cursor.lastrowid
 
 
+@_timed
 def get_due_reminders(now_iso: str) -> list[Reminder]:
     with get_connection() as conn:
         cursor = conn.execute(
-            """
-            SELECT id, user_id, task_id, time_hhmm, next_fire_at, is_active, created_at, last_fired_at
+            f"""
+            SELECT {_COLUMNS}
             FROM reminders
             WHERE is_active = 1 AND next_fire_at <= ?
             """,
             (now_iso,),
         )
         rows = cursor.fetchall()
-    return [
-        Reminder(
-            id=row[0],
-            user_id=row[1],
-            task_id=row[2],
-            time_hhmm=row[3],
-            next_fire_at=row[4],
-            is_active=row[5],
-            created_at=row[6],
-            last_fired_at=row[7],
+    return [_to_reminder(row) for row in rows]
+
+
+@_timed
+def claim_due_reminders(
+    owner: str,
+    now_iso: str,
+    claim_until_iso: str,
+    limit: int,
+) -> list[tuple[Reminder, str | None]]:
+    """Atomically take up to ``limit`` due reminders for ``owner``.
+
+    A claimed reminder is skipped until its claim expires, so concurrent
+    workers never send the same reminder twice.
+    """
+    with get_connection() as conn:
+        cursor = conn.execute(
+            """
+            UPDATE reminders
+            SET claimed_by = ?, claim_until = ?
+            WHERE id IN (
+                SELECT id FROM reminders
+                WHERE is_active = 1 AND next_fire_at <= ?
+                  AND (claim_until IS NULL OR claim_until <= ?)
+                LIMIT ?
+            )
+            RETURNING id, user_id, task_id, time_hhmm, next_fire_at, is_active,
+                      created_at, last_fired_at,
+                      (
+                          SELECT t.text FROM tasks AS t
+                          WHERE t.id = reminders.task_id AND t.user_id = reminders.user_id
+                      )
+            """,
+            (owner, claim_until_iso, now_iso, now_iso, limit),
+        )
+        rows = cursor.fetchall()
+    return [(_to_reminder(row), row[8]) for row in rows]
+
+
+@_timed
+def get_active_reminders() -> list[Reminder]:
+    with get_connection() as conn:
+        cursor = conn.execute(
+            f"""
+            SELECT {_COLUMNS}
+            FROM reminders
+            WHERE is_active = 1
+            """
         )
-        for row in rows
-    ]
+        rows = cursor.fetchall()
+    return [_to_reminder(row) for row in rows]
 
 
+@_timed
 def mark_fired(reminder_id: int, fired_at_iso: str) -> None:
     with get_connection() as conn:
         conn.execute(
@@ -58,6 +118,32 @@ def mark_fired(reminder_id: int, fired_at_iso: str) -> None:
         )
 
 
+@_timed
+def finish_reminders(
+    fired_ids: Iterable[int],
+    fired_at_iso: str,
+    orphan_ids: Iterable[int] = (),
+) -> None:
+    fired = [(reminder_id,) for reminder_id in fired_ids]
+    orphans = [(reminder_id,) for reminder_id in orphan_ids]
+    with get_connection() as conn:
+        conn.executemany(
+            "UPDATE reminders SET last_fired_at = ? WHERE id = ?",
+            [(fired_at_iso, reminder_id) for (reminder_id,) in fired],
+        )
+        conn.executemany("DELETE FROM reminders WHERE id = ?", fired + orphans)
+
+
+@_timed
+def extend_claims(reminder_ids: Iterable[int], claim_until_iso: str) -> None:
+    with get_connection() as conn:
+        conn.executemany(
+            "UPDATE reminders SET claim_until = ? WHERE id = ?",
+            [(claim_until_iso, reminder_id) for reminder_id in reminder_ids],
+        )
+
+
+@_timed
 def deactivate_by_task(user_id: int, task_id: int) -> None:
     with get_connection() as conn:
         conn.execute(
@@ -70,6 +156,7 @@ def deactivate_by_task(user_id: int, task_id: int) -> None:
         )
 
 
+@_timed
 def delete_reminder(reminder_id: int) -> None:
     with get_connection() as conn:
         conn.execute(
@@ -78,6 +165,38 @@ def delete_reminder(reminder_id: int) -> None:
         )
 
 
+@_timed
+def delete_user_reminder(user_id: int, reminder_id: int) -> int | None:
+    with get_connection() as conn:
+        row = conn.execute(
+            "DELETE FROM reminders WHERE user_id = ? AND id = ? RETURNING id",
+            (user_id, reminder_id),
+        ).fetchone()
+    return row[0] if row else None
+
+
+@_timed
+def delete_user_reminder_at(user_id: int, index: int) -> int | None:
+    if index < 0:
+        return None
+    with get_connection() as conn:
+        row = conn.execute(
+            """
+            DELETE FROM reminders
+            WHERE id = (
+                SELECT id FROM reminders
+                WHERE user_id = ? AND is_active = 1
+                ORDER BY next_fire_at
+                LIMIT 1 OFFSET ?
+            )
+            RETURNING id
+            """,
+            (user_id, index),
+        ).fetchone()
+    return row[0] if row else None
+
+
+@_timed
 def delete_by_task(user_id: int, task_id: int) -> None:
     with get_connection() as conn:
         conn.execute(
@@ -86,11 +205,12 @@ def delete_by_task(user_id: int, task_id: int) -> None:
         )
 
 
+@_timed
 def list_user_reminders(user_id: int) -> list[Reminder]:
     with get_connection() as conn:
         cursor = conn.execute(
-            """
-            SELECT id, user_id, task_id, time_hhmm, next_fire_at, is_active, created_at, last_fired_at
+            f"""
+            SELECT {_COLUMNS}
             FROM reminders
             WHERE user_id = ? AND is_active = 1
             ORDER BY next_fire_at
@@ -98,16 +218,4 @@ def list_user_reminders(user_id: int) -> list[Reminder]:
             (user_id,),
         )
         rows = cursor.fetchall()
-    return [
-        Reminder(
-            id=row[0],
-            user_id=row[1],
-            task_id=row[2],
-            time_hhmm=row[3],
-            next_fire_at=row[4],
-            is_active=row[5],
-            created_at=row[6],
-            last_fired_at=row[7],
-        )
-        for row in rows
-    ]
+    return [_to_reminder(row) for row in rows]
@@ -1,8 +1,12 @@
 from datetime import date
 from typing import Optional
 
-from app.db.database import get_connection
-from app.schemas.task import Task, TaskRecord
+from app.db.database import QUERY_SECONDS, get_connection
+from app.schemas.task import Task, TaskPage, TaskRecord
+from app.utils.metrics import timed
+
+_timed = timed(QUERY_SECONDS, repo="tasks")
+
 
 def _serialize_due_date(due_date: Optional[date]) -> Optional[str]:
     return due_date.isoformat() if due_date else None
@@ -14,6 +18,7 @@ def _deserialize_due_date(value: Optional[str]) -> Optional[date]:
     return date.fromisoformat(value)
 
 
+@_timed
 def add_task(user_id: int, task: Task) -> int:
     with get_connection() as conn:
         cursor = conn.execute(
@@ -22,10 +27,47 @@ def add_task(user_id: int, task: Task) -> int:
         )
         return cursor.lastrowid
 
+
+# Three bound parameters per row keeps a chunk under SQLite's default
+# limit of 999 variables per statement.
+INSERT_CHUNK_ROWS = 300
+
+
+@_timed
+def add_tasks(user_id: int, tasks: list[Task]) -> list[int]:
+    task_ids: list[int] = []
+    with get_connection() as conn:
+        for start in range(0, len(tasks), INSERT_CHUNK_ROWS):
+            chunk = tasks[start:start + INSERT_CHUNK_ROWS]
+            placeholders = ", ".join(["(?, ?, ?)"] * len(chunk))
+            params = [
+                value
+                for task in chunk
+                for value in (user_id, task.title, _serialize_due_date(task.due_date))
+            ]
+            rows = conn.execute(
+                f"INSERT INTO tasks (user_id, text, due_date) VALUES {placeholders} RETURNING id",
+                params,
+            ).fetchall()
+            # RETURNING order is unspecified; AUTOINCREMENT ids follow row order.
+            task_ids.extend(sorted(row[0] for row in rows))
+    return task_ids
+
+
+@_timed
+def add_task_rows(rows: list[tuple[int, str, Optional[str]]]) -> None:
+    with get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO tasks (user_id, text, due_date) VALUES (?, ?, ?)",
+            rows,
+        )
+
+
+@_timed
 def get_tasks(user_id: int) -> list[TaskRecord]:
     with get_connection() as conn:
         cursor = conn.execute(
-            "SELECT id, text, due_date FROM tasks WHERE user_id = ?",
+            "SELECT id, text, due_date FROM tasks WHERE user_id = ? ORDER BY id",
             (user_id,)
         )
         rows = cursor.fetchall()
@@ -38,6 +80,67 @@ def get_tasks(user_id: int) -> list[TaskRecord]:
     return tasks
 
 
+@_timed
+def has_more_tasks_than(user_id: int, count: int) -> bool:
+    # Walks the (user_id, id) index only, without reading the rows.
+    with get_connection() as conn:
+        return conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM tasks WHERE user_id = ? ORDER BY id LIMIT 1 OFFSET ?)",
+            (user_id, count),
+        ).fetchone()[0] == 1
+
+
+@_timed
+def get_tasks_page(
+    user_id: int,
+    after_id: int = 0,
+    before_id: int | None = None,
+    limit: int = 20,
+) -> TaskPage:
+    with get_connection() as conn:
+        if before_id is None:
+            rows = conn.execute(
+                """
+                SELECT id, text, due_date FROM tasks
+                WHERE user_id = ? AND id > ?
+                ORDER BY id
+                LIMIT ?
+                """,
+                (user_id, after_id, limit + 1),
+            ).fetchall()
+            has_next = len(rows) > limit
+            rows = rows[:limit]
+            boundary = rows[0][0] if rows else after_id + 1
+            has_prev = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM tasks WHERE user_id = ? AND id < ?)",
+                (user_id, boundary),
+            ).fetchone()[0] == 1
+        else:
+            rows = conn.execute(
+                """
+                SELECT id, text, due_date FROM tasks
+                WHERE user_id = ? AND id < ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (user_id, before_id, limit + 1),
+            ).fetchall()
+            has_prev = len(rows) > limit
+            rows = rows[:limit][::-1]
+            boundary = rows[-1][0] if rows else before_id - 1
+            has_next = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM tasks WHERE user_id = ? AND id > ?)",
+                (user_id, boundary),
+            ).fetchone()[0] == 1
+
+    records = [
+        TaskRecord(id=task_id, task=Task(title=text, due_date=_deserialize_due_date(due_date)))
+        for task_id, text, due_date in rows
+    ]
+    return TaskPage(records=records, has_prev=has_prev, has_next=has_next)
+
+
+@_timed
 def get_task_by_id(user_id: int, task_id: int) -> TaskRecord | None:
     with get_connection() as conn:
         cursor = conn.execute(
@@ -53,9 +156,54 @@ def get_task_by_id(user_id: int, task_id: int) -> TaskRecord | None:
     task = Task(title=text, due_date=_deserialize_due_date(due_date))
     return TaskRecord(id=task_id, task=task)
 
+@_timed
 def delete_task(task_id: int) -> None:
     with get_connection() as conn:
         conn.execute(
             "DELETE FROM tasks WHERE id = ?",
             (task_id,)
         )
+
+
+def _delete_with_reminders(sql: str, params: tuple) -> TaskRecord | None:
+    with get_connection() as conn:
+        row = conn.execute(sql, params).fetchone()
+        if not row:
+            return None
+
+        task_id, user_id, text, due_date = row
+        conn.execute(
+            "DELETE FROM reminders WHERE user_id = ? AND task_id = ?",
+            (user_id, task_id),
+        )
+
+    task = Task(title=text, due_date=_deserialize_due_date(due_date))
+    return TaskRecord(id=task_id, task=task)
+
+
+@_timed
+def delete_user_task(user_id: int, task_id: int) -> TaskRecord | None:
+    return _delete_with_reminders(
+        """
+        DELETE FROM tasks
+        WHERE user_id = ? AND id = ?
+        RETURNING id, user_id, text, due_date
+        """,
+        (user_id, task_id),
+    )
+
+
+@_timed
+def delete_user_task_at(user_id: int, index: int) -> TaskRecord | None:
+    if index < 0:
+        return None
+    return _delete_with_reminders(
+        """
+        DELETE FROM tasks
+        WHERE id = (
+            SELECT id FROM tasks WHERE user_id = ? ORDER BY id LIMIT 1 OFFSET ?
+        )
+        RETURNING id, user_id, text, due_date
+        """,
+        (user_id, index),
+    )
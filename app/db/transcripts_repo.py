@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable
+
+from app.db.database import get_connection
+
+
+def get_transcript(key: str) -> str | None:
+    with get_connection() as conn:
+        row = conn.execute(
+            "UPDATE transcriptions SET last_used_at = ? WHERE key = ? RETURNING text",
+            (time.time(), key),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def save_transcript(keys: Iterable[str], text: str, max_entries: int) -> None:
+    now = time.time()
+    with get_connection() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO transcriptions (key, text, last_used_at) VALUES (?, ?, ?)",
+            [(key, text, now) for key in keys],
+        )
+        conn.execute(
+            """
+            DELETE FROM transcriptions
+            WHERE key IN (
+                SELECT key FROM transcriptions
+                ORDER BY last_used_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (max_entries,),
+        )
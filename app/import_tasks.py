@@ -0,0 +1,97 @@
+"""Bulk import of tasks from CSV or JSON Lines.
+
+    python -m app.import_tasks tasks.csv
+    python -m app.import_tasks tasks.jsonl --chunk-size 10000
+
+Each record needs user_id and text; due_date (YYYY-MM-DD) is optional.
+CSV files must have a header row. Records are streamed and committed in
+chunks, so memory use does not depend on the file size.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.db.database import close_db, init_db
+from app.db.tasks_repo import add_task_rows
+
+DEFAULT_CHUNK_SIZE = 5000
+
+Row = tuple[int, str, Optional[str]]
+
+
+def _to_row(record: dict | str) -> Row:
+    # JSON Lines records arrive undecoded, so a broken line is skipped like
+    # any other invalid record.
+    if isinstance(record, str):
+        record = json.loads(record)
+        if not isinstance(record, dict):
+            raise ValueError("not a JSON object")
+    text = record.get("text")
+    if not isinstance(text, str):
+        raise ValueError("missing text")
+    text = text.strip()
+    if not text:
+        raise ValueError("empty text")
+    due_date = record.get("due_date") or None
+    if due_date:
+        due_date = date.fromisoformat(str(due_date)).isoformat()
+    return int(record["user_id"]), text, due_date
+
+
+def _read_records(path: Path) -> Iterator[dict | str]:
+    with path.open(encoding="utf-8", newline="") as file:
+        if path.suffix.lower() == ".csv":
+            yield from csv.DictReader(file)
+            return
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def import_tasks(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple[int, int]:
+    imported = 0
+    skipped = 0
+    chunk: list[Row] = []
+    for line_no, record in enumerate(_read_records(path), start=1):
+        try:
+            chunk.append(_to_row(record))
+        except (KeyError, TypeError, ValueError) as exc:
+            skipped += 1
+            print(f"record {line_no}: skipped ({exc})", file=sys.stderr)
+            continue
+
+        if len(chunk) >= chunk_size:
+            add_task_rows(chunk)
+            imported += len(chunk)
+            chunk = []
+
+    if chunk:
+        add_task_rows(chunk)
+        imported += len(chunk)
+    return imported, skipped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import tasks from CSV or JSON Lines.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    try:
+        imported, skipped = import_tasks(args.path, args.chunk_size)
+    finally:
+        close_db()
+    elapsed = time.perf_counter() - started
+    print(f"imported={imported} skipped={skipped} seconds={elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
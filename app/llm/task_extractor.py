@@ -1,27 +1,71 @@
-import re
+from datetime import date
 
 from app.schemas.task import Task
-from app.dates.parser import parse_date
+from app.dates.parser import date_matches, resolve_matches
 
+_SEPARATOR = " и "
+_TITLE_STRIP = " ,.;:"
 
-def extract_tasks(text: str) -> list[Task]:
+
+def _lower_keeping_offsets(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A handful of characters (e.g. "İ") grow when lowercased; leave them
+    # as they are so match offsets still index the original text.
+    return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+
+def extract_tasks(text: str | None, today: date | None = None) -> list[Task]:
+    """Split a message into tasks, taking each task's due date from its text.
+
+    Whitespace is normalised and the message lowercased and scanned for
+    dates once; the matches are then handed to the parts they fall in,
+    which gives each part its due date and its title with date tokens cut
+    out. Date tokens never contain the separator, so no match spans parts.
+    Tasks have no time of day, so a time only makes the due date today
+    when there is no date, and stays in the title.
+    """
     if not text:
         return []
 
-    parts = [p.strip() for p in re.split(r"\s+и\s+", text) if p.strip()]
-    tasks: list[Task] = []
+    text = " ".join(text.split())
+    matches = date_matches(_lower_keeping_offsets(text))
+    if not matches:
+        return [
+            Task(title=title.capitalize())
+            for title in (part.strip(_TITLE_STRIP) for part in text.split(_SEPARATOR))
+            if title
+        ]
 
-    for part in parts:
-        due = parse_date(part)
-        clean_title = _strip_date_tokens(part)
-        if clean_title:
-            tasks.append(Task(title=clean_title.capitalize(), due_date=due))
+    if today is None:
+        today = date.today()
+    tasks: list[Task] = []
+    index = 0
+    part_start = 0
+    for part in text.split(_SEPARATOR):
+        part_end = part_start + len(part)
+        first = index
+        while index < len(matches) and matches[index].start() < part_end:
+            index += 1
 
-    return tasks
+        due: date | None = None
+        if index > first:
+            own = matches[first:index]
+            due, _ = resolve_matches(own, today)
+            pieces: list[str] = []
+            position = part_start
+            for match in own:
+                if match.lastgroup == "time":
+                    continue
+                pieces.append(text[position:match.start()])
+                position = match.end()
+            pieces.append(text[position:part_end])
+            part = " ".join("".join(pieces).split())
 
+        title = part.strip(_TITLE_STRIP)
+        if title:
+            tasks.append(Task(title=title.capitalize(), due_date=due))
+        part_start = part_end + len(_SEPARATOR)
 
-def _strip_date_tokens(text: str) -> str:
-    clean = re.sub(r"\b(сегодня|завтра|послезавтра)\b", "", text, flags=re.IGNORECASE)
-    clean = re.sub(r"\b\d{1,2}[./]\d{1,2}\b", "", clean)
-    clean = " ".join(clean.split())
-    return clean.strip(" ,.;:")
+    return tasks
@@ -1,10 +1,24 @@
 import asyncio
-from app.db.database import init_db
+from app.config import BOT_MODE
+from app.db.database import close_db, init_db
 from app.bot.main import register_handlers
+from app.bot.webhook import run as run_webhook_workers
 
 async def main():
     init_db()
-    await register_handlers()
+    try:
+        await register_handlers()
+    finally:
+        close_db()
+
+def run_webhook():
+    # Migrations run once here; every webhook worker opens its own connections.
+    init_db()
+    close_db()
+    run_webhook_workers()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if BOT_MODE == "webhook":
+        run_webhook()
+    else:
+        asyncio.run(main())
@@ -13,3 +13,10 @@ class Task:
 class TaskRecord:
     id: int
     task: Task
+
+
+@dataclass(frozen=True)
+class TaskPage:
+    records: list[TaskRecord]
+    has_prev: bool
+    has_next: bool
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+from app.schemas.task import Task
+
+
+@dataclass(frozen=True)
+class PendingVoice:
+    user_id: int
+    text: str
+    created_at: float
+    tasks: tuple[Task, ...] = ()
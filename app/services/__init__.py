@@ -1,3 +1,17 @@
-from app.services.tasks import create_tasks, delete_task_by_index, list_tasks
+from app.services.tasks import (
+    create_tasks,
+    delete_task_by_id,
+    delete_task_by_index,
+    list_tasks,
+    list_tasks_page,
+    save_tasks,
+)
 
-__all__ = ["create_tasks", "delete_task_by_index", "list_tasks"]
+__all__ = [
+    "create_tasks",
+    "delete_task_by_id",
+    "delete_task_by_index",
+    "list_tasks",
+    "list_tasks_page",
+    "save_tasks",
+]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import itertools
+import time
+from collections import OrderedDict
+
+from app.schemas.task import TaskRecord
+
+TASK_CACHE_SIZE = 1024
+TASK_CACHE_TTL_SECONDS = 300.0
+# Versions kept beyond maxsize before they are dropped all at once.
+VERSION_SLACK = 1024
+
+
+class TaskListCache:
+    """LRU cache of per-user task lists with a TTL.
+
+    Cached lists are never mutated in place, so callers may keep references.
+    """
+
+    def __init__(self, maxsize: int = TASK_CACHE_SIZE, ttl: float = TASK_CACHE_TTL_SECONDS) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[int, tuple[float, list[TaskRecord]]] = OrderedDict()
+        # Versions come from one increasing clock. Users without an entry
+        # report the floor, which is raised past every version dropped, so
+        # a load that raced a write never sees its old version again.
+        self._clock = itertools.count(1)
+        self._versions: dict[int, int] = {}
+        self._floor = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def enabled(self) -> bool:
+        # maxsize=0 turns caching off, e.g. when several processes write.
+        return self.maxsize > 0
+
+    def version(self, user_id: int) -> int:
+        return self._versions.get(user_id, self._floor)
+
+    def get(self, user_id: int) -> list[TaskRecord] | None:
+        item = self._items.get(user_id)
+        if item is None or time.monotonic() - item[0] > self.ttl:
+            if item is not None:
+                del self._items[user_id]
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(user_id)
+        self.hits += 1
+        return item[1]
+
+    def set(self, user_id: int, records: list[TaskRecord], version: int | None = None) -> None:
+        # A write that happened while the list was being loaded makes it stale.
+        if version is not None and version != self.version(user_id):
+            return
+
+        self._items[user_id] = (time.monotonic(), records)
+        self._items.move_to_end(user_id)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def add(self, user_id: int, records: list[TaskRecord]) -> None:
+        self._bump(user_id)
+        item = self._items.get(user_id)
+        if item is not None:
+            self._items[user_id] = (item[0], item[1] + records)
+
+    def discard(self, user_id: int, task_id: int) -> None:
+        self._bump(user_id)
+        item = self._items.get(user_id)
+        if item is not None:
+            self._items[user_id] = (item[0], [record for record in item[1] if record.id != task_id])
+
+    def invalidate(self, user_id: int) -> None:
+        self._bump(user_id)
+        self._items.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._drop_versions()
+
+    def _bump(self, user_id: int) -> None:
+        if len(self._versions) >= self.maxsize + VERSION_SLACK:
+            self._drop_versions()
+        self._versions[user_id] = next(self._clock)
+
+    def _drop_versions(self) -> None:
+        # Loads in flight are then refused by set(), which only costs a refill.
+        self._floor = next(self._clock)
+        self._versions.clear()
+
+
+task_cache = TaskListCache()
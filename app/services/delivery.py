@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+from app.utils.metrics import counter
+
+# Telegram allows roughly 30 messages per second overall and 1 per second per chat.
+GLOBAL_RATE = 30.0
+PER_CHAT_RATE = 1.0
+MAX_CONCURRENCY = 16
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 1.0
+CHAT_BUCKETS_PRUNE_AT = 10_000
+# The bot was blocked or the chat is gone: retrying can never succeed.
+PERMANENT_ERRORS = (TelegramForbiddenError, TelegramBadRequest, TelegramNotFound)
+
+logger = logging.getLogger(__name__)
+
+MESSAGES = counter(
+    "bot_fanout_messages_total",
+    "Fan-out messages by outcome: sent, failed, retried or skipped.",
+    ("result",),
+)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        # Empty the bucket and refill it only from the end of the pause.
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated = self._paused_until
+
+    def is_full(self, now: float) -> bool:
+        return now >= self._paused_until and self._tokens + (now - self._updated) * self.rate >= self.capacity
+
+
+class RateLimiter:
+    """Global and per-chat buckets shared by every fan-out in the process.
+
+    Buckets must outlive a single fan-out: fresh ones start full, so every
+    batch would otherwise get an extra burst above the limit.
+    """
+
+    def __init__(self, global_rate: float = GLOBAL_RATE, per_chat_rate: float = PER_CHAT_RATE) -> None:
+        self.per_chat_rate = per_chat_rate
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: dict[int, TokenBucket] = {}
+        self._prune_at = CHAT_BUCKETS_PRUNE_AT
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= self._prune_at:
+                self._prune()
+            bucket = TokenBucket(self.per_chat_rate, 1)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    def _prune(self) -> None:
+        # A refilled bucket behaves exactly like a new one, so it can go.
+        now = time.monotonic()
+        self._chats = {chat_id: bucket for chat_id, bucket in self._chats.items() if not bucket.is_full(now)}
+        self._prune_at = max(CHAT_BUCKETS_PRUNE_AT, 2 * len(self._chats))
+
+    async def acquire(self, chat_id: int) -> None:
+        await self._chat_bucket(chat_id).acquire()
+        await self._global.acquire()
+
+    def pause(self, seconds: float) -> None:
+        """Stop all sends for ``seconds``, as Telegram asks with RetryAfter."""
+        self._global.pause(seconds)
+
+
+@dataclass
+class DeliveryStats:
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    skipped: int = 0
+
+    def add(self, other: "DeliveryStats") -> None:
+        self.sent += other.sent
+        self.failed += other.failed
+        self.retried += other.retried
+        self.skipped += other.skipped
+
+
+# One per process, so consecutive fan-outs share the Telegram limits.
+rate_limiter = RateLimiter()
+
+
+class MessageFanout:
+    """Send messages concurrently within the Telegram limits.
+
+    ``send`` returns the UTC time Telegram accepted the message, or None
+    when it was not sent. Chats that reject a message for good are not
+    retried and end up in ``undeliverable``. Once ``stop`` is set,
+    messages not yet sent are skipped without calling the Bot API.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        concurrency: int = MAX_CONCURRENCY,
+        limiter: RateLimiter | None = None,
+        stop: asyncio.Event | None = None,
+    ) -> None:
+        self.bot = bot
+        self.stats = DeliveryStats()
+        self.limiter = limiter or rate_limiter
+        self.stop = stop
+        self.undeliverable: set[int] = set()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def _stopped(self) -> bool:
+        return self.stop is not None and self.stop.is_set()
+
+    async def send(self, chat_id: int, text: str) -> datetime | None:
+        async with self._semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                if chat_id in self.undeliverable:
+                    break
+                if not self._stopped():
+                    await self.limiter.acquire(chat_id)
+                if self._stopped():
+                    self.stats.skipped += 1
+                    return None
+                try:
+                    await self.bot.send_message(chat_id, text)
+                except TelegramRetryAfter as exc:
+                    # The limit is per bot, so every sender waits, not just this one.
+                    self.limiter.pause(exc.retry_after)
+                    delay = exc.retry_after
+                except (TelegramNetworkError, TelegramServerError):
+                    delay = BACKOFF_BASE_SECONDS * 2 ** attempt
+                except PERMANENT_ERRORS as exc:
+                    logger.warning("Chat %s rejected the message: %s", chat_id, exc)
+                    self.undeliverable.add(chat_id)
+                    break
+                except Exception:
+                    logger.exception("Failed to send message to chat %s", chat_id)
+                    break
+                else:
+                    self.stats.sent += 1
+                    return datetime.now(timezone.utc)
+
+                if attempt == MAX_RETRIES:
+                    break
+                self.stats.retried += 1
+                await asyncio.sleep(delay)
+
+        self.stats.failed += 1
+        return None
+
+    async def send_many(self, messages: list[tuple[int, str]]) -> list[datetime | None]:
+        results = await asyncio.gather(*(self.send(chat_id, text) for chat_id, text in messages))
+        MESSAGES.inc(self.stats.sent, result="sent")
+        MESSAGES.inc(self.stats.failed, result="failed")
+        MESSAGES.inc(self.stats.retried, result="retried")
+        MESSAGES.inc(self.stats.skipped, result="skipped")
+        logger.info(
+            "Fan-out done: sent=%s failed=%s retried=%s skipped=%s",
+            self.stats.sent,
+            self.stats.failed,
+            self.stats.retried,
+            self.stats.skipped,
+        )
+        return list(results)
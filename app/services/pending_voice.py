@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from app.config import PENDING_PERSIST
+from app.db.database import run_read, run_write
+from app.db.pending_repo import (
+    delete_pending_before,
+    get_pending,
+    load_pending,
+    save_pending,
+    take_pending,
+)
+from app.schemas.voice import PendingVoice
+
+PENDING_TTL_SECONDS = 15 * 60
+PENDING_MAX_ENTRIES = 10_000
+SWEEP_INTERVAL_SECONDS = 60
+AUDIO_DIR = Path("data/audio")
+
+logger = logging.getLogger(__name__)
+
+
+class PendingVoiceStore:
+    """Unconfirmed voice previews, oldest first.
+
+    Entries are kept in insertion order, which is also expiry order because
+    the TTL is fixed, so expiring and evicting only ever touch the front.
+    When persisted, the table is the source of truth: a request created by
+    another bot process is found there, and whoever deletes the row owns it.
+    """
+
+    def __init__(
+        self,
+        ttl: float = PENDING_TTL_SECONDS,
+        max_entries: int = PENDING_MAX_ENTRIES,
+        persist: bool = PENDING_PERSIST,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.persist = persist
+        self._items: OrderedDict[str, PendingVoice] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def load(self) -> None:
+        if not self.persist:
+            return
+        rows = await run_read(load_pending, time.time() - self.ttl, self.max_entries)
+        self._items = OrderedDict(rows)
+
+    async def get(self, request_id: str) -> PendingVoice | None:
+        pending = self._items.get(request_id)
+        if pending is None and self.persist:
+            pending = await run_read(get_pending, request_id)
+        if pending is None or time.time() - pending.created_at > self.ttl:
+            return None
+        return pending
+
+    async def add(self, request_id: str, pending: PendingVoice) -> None:
+        self._items[request_id] = pending
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+        if self.persist:
+            await run_write(save_pending, request_id, pending)
+
+    async def pop(self, request_id: str) -> PendingVoice | None:
+        pending = self._items.pop(request_id, None)
+        if self.persist:
+            pending = await run_write(take_pending, request_id)
+        return pending
+
+    async def expire(self) -> int:
+        cutoff = time.time() - self.ttl
+        expired = 0
+        while self._items:
+            request_id, pending = next(iter(self._items.items()))
+            if pending.created_at >= cutoff:
+                break
+            self._items.popitem(last=False)
+            expired += 1
+        if self.persist:
+            await run_write(delete_pending_before, cutoff)
+        return expired
+
+
+def remove_stale_audio(max_age: float = PENDING_TTL_SECONDS) -> int:
+    # Voice notes are decoded in memory now; anything left here is an orphan.
+    if not AUDIO_DIR.exists():
+        return 0
+
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in AUDIO_DIR.iterdir():
+        if path.suffix not in (".ogg", ".wav") or not path.is_file():
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            logger.exception("Failed to delete audio file: %s", path)
+    return removed
+
+
+async def pending_sweeper(store: PendingVoiceStore, interval: float = SWEEP_INTERVAL_SECONDS) -> None:
+    while True:
+        try:
+            expired = await store.expire()
+            removed = await asyncio.to_thread(remove_stale_audio)
+            if expired or removed:
+                logger.info("Expired %s pending voice requests, removed %s audio files", expired, removed)
+        except Exception:
+            logger.exception("Pending voice sweep failed")
+        await asyncio.sleep(interval)
+
+
+pending_store = PendingVoiceStore()
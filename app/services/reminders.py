@@ -1,16 +1,62 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
+import socket
+import time
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from aiogram import Bot
 
 from app.bot import messages
-from app.db.reminders_repo import create_reminder, delete_reminder, get_due_reminders, mark_fired
+from app.db.database import run_read, run_write
+from app.db.leases_repo import acquire_lease, release_lease
+from app.db.reminders_repo import (
+    claim_due_reminders,
+    create_reminder,
+    delete_user_reminder,
+    delete_user_reminder_at,
+    extend_claims,
+    finish_reminders,
+    get_active_reminders,
+    list_user_reminders,
+)
 from app.db.tasks_repo import get_task_by_id
+from app.schemas.reminder import Reminder
+from app.schemas.task import TaskRecord
+from app.services.delivery import DeliveryStats, MessageFanout, RateLimiter
+from app.services.scheduler import parse_fire_at, scheduler
+from app.utils.metrics import counter, histogram
 
 DEFAULT_TZ = ZoneInfo("Europe/Moscow")
+RETRY_DELAY_SECONDS = 45
+
+# Due reminders are claimed in batches; a claim must outlive sending one
+# batch under the global rate limit, or another process could take it over.
+CLAIM_BATCH_SIZE = 500
+CLAIM_SECONDS = 120
+
+# Only the lease holder sends reminders, so the Telegram rate limit is
+# respected across processes; the others wait to take over.
+LEADER_LEASE = "reminder-worker"
+LEADER_LEASE_SECONDS = 60
+LEADER_RENEW_SECONDS = 20
+LEADER_RETRY_SECONDS = 15
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Lag is measured from next_fire_at to the moment the message was sent;
+# minute-granular reminders make the seconds-to-minutes buckets the useful ones.
+REMINDER_LAG_SECONDS = histogram(
+    "bot_reminder_lag_seconds",
+    "Delay between a reminder's next_fire_at and its delivery.",
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0, 3600.0),
+)
+REMINDER_RUN_ERRORS = counter("bot_reminder_run_errors_total", "Reminder runs that failed with an exception.")
+
+logger = logging.getLogger(__name__)
 
 
 def compute_next_fire_at(hhmm: str, now: datetime, tz: ZoneInfo) -> datetime:
@@ -22,40 +68,184 @@ def compute_next_fire_at(hhmm: str, now: datetime, tz: ZoneInfo) -> datetime:
     return candidate.astimezone(timezone.utc)
 
 
-def schedule_reminder(user_id: int, task_id: int, hhmm: str, tz: ZoneInfo = DEFAULT_TZ) -> int:
+def _list_reminders_with_tasks(user_id: int) -> list[tuple[Reminder, TaskRecord | None]]:
+    return [
+        (reminder, get_task_by_id(user_id, reminder.task_id))
+        for reminder in list_user_reminders(user_id)
+    ]
+
+
+async def schedule_reminder(user_id: int, task_id: int, hhmm: str, tz: ZoneInfo = DEFAULT_TZ) -> int:
     now = datetime.now(timezone.utc)
     next_fire_at = compute_next_fire_at(hhmm, now, tz)
-    return create_reminder(
+    reminder_id = await run_write(
+        create_reminder,
         user_id=user_id,
         task_id=task_id,
         time_hhmm=hhmm,
         next_fire_at=next_fire_at.isoformat(timespec="seconds"),
     )
+    scheduler.add(reminder_id, user_id, task_id, next_fire_at)
+    return reminder_id
+
+
+async def list_reminders(user_id: int) -> list[tuple[Reminder, TaskRecord | None]]:
+    return await run_read(_list_reminders_with_tasks, user_id)
+
+
+async def get_reminders(user_id: int) -> list[Reminder]:
+    return await run_read(list_user_reminders, user_id)
+
+
+async def delete_reminder_by_id(user_id: int, reminder_id: int) -> bool:
+    deleted_id = await run_write(delete_user_reminder, user_id, reminder_id)
+    if deleted_id is None:
+        return False
+
+    scheduler.remove(deleted_id)
+    return True
+
+
+async def delete_reminder_by_index(user_id: int, index: int) -> bool:
+    deleted_id = await run_write(delete_user_reminder_at, user_id, index)
+    if deleted_id is None:
+        return False
 
+    scheduler.remove(deleted_id)
+    return True
 
-async def fire_due_reminders(bot: Bot, now: datetime | None = None) -> None:
+
+async def fire_due_reminders(
+    bot: Bot,
+    now: datetime | None = None,
+    limiter: RateLimiter | None = None,
+    stop: asyncio.Event | None = None,
+) -> DeliveryStats:
+    """Send every due reminder, claiming them in batches.
+
+    Setting ``stop`` ends the run early: no new batch is claimed, unsent
+    reminders of the current one are skipped and their claims released.
+    """
     now_dt = now or datetime.now(timezone.utc)
     now_iso = now_dt.isoformat(timespec="seconds")
-    reminders = get_due_reminders(now_iso)
+    started = time.monotonic()
+    stats = DeliveryStats()
+
+    while True:
+        if stop is not None and stop.is_set():
+            return stats
+
+        # Each batch gets a full claim window, however long earlier ones took.
+        batch_now = now_dt + timedelta(seconds=time.monotonic() - started)
+        claim_until_iso = (batch_now + timedelta(seconds=CLAIM_SECONDS)).isoformat(timespec="seconds")
+        retry_at = batch_now + timedelta(seconds=RETRY_DELAY_SECONDS)
+        rows = await run_write(claim_due_reminders, WORKER_ID, now_iso, claim_until_iso, CLAIM_BATCH_SIZE)
+
+        orphan_ids: list[int] = []
+        deliverable: list[Reminder] = []
+        outgoing: list[tuple[int, str]] = []
+        for reminder, title in rows:
+            if title is None:
+                orphan_ids.append(reminder.id)
+                continue
+
+            deliverable.append(reminder)
+            outgoing.append((reminder.user_id, messages.REMIND_NOTIFICATION.format(text=title)))
+
+        fanout = MessageFanout(bot, limiter=limiter, stop=stop)
+        results = await fanout.send_many(outgoing)
+        stats.add(fanout.stats)
 
-    for reminder in reminders:
-        task_record = get_task_by_id(reminder.user_id, reminder.task_id)
-        if not task_record:
-            delete_reminder(reminder.id)
-            continue
+        stopped = stop is not None and stop.is_set()
+        fired_ids: list[int] = []
+        failed_ids: list[int] = []
+        for reminder, sent_at in zip(deliverable, results):
+            if sent_at is not None:
+                fired_ids.append(reminder.id)
+                lag = sent_at - parse_fire_at(reminder.next_fire_at)
+                REMINDER_LAG_SECONDS.observe(max(lag.total_seconds(), 0.0))
+                continue
+            if reminder.user_id in fanout.undeliverable:
+                # Finished like an orphan rather than retried forever.
+                orphan_ids.append(reminder.id)
+                continue
 
-        text = messages.REMIND_NOTIFICATION.format(text=task_record.task.title)
+            failed_ids.append(reminder.id)
+            if not stopped:
+                # Keep failed reminders active and retry them later; holding
+                # the claim until then keeps every process from retrying earlier.
+                scheduler.add(reminder.id, reminder.user_id, reminder.task_id, retry_at)
+
+        if fired_ids or orphan_ids:
+            await run_write(finish_reminders, fired_ids, now_iso, orphan_ids)
+        if failed_ids:
+            # After a stop the claims end at the run's start, which has
+            # passed, so the next leader can take them at once.
+            claim_until = now_iso if stopped else retry_at.isoformat(timespec="seconds")
+            await run_write(extend_claims, failed_ids, claim_until)
+
+        if len(rows) < CLAIM_BATCH_SIZE:
+            return stats
+
+
+async def _hold_lease(lost: asyncio.Event) -> None:
+    # Runs for the length of a reminder run, which can far outlast the lease.
+    while True:
+        await asyncio.sleep(LEADER_RENEW_SECONDS)
         try:
-            await bot.send_message(reminder.user_id, text)
+            renewed = await run_write(acquire_lease, LEADER_LEASE, WORKER_ID, LEADER_LEASE_SECONDS)
         except Exception:
-            # Skip failures to avoid blocking other reminders; keep active to retry.
-            continue
+            logger.exception("Could not renew the reminder lease")
+            renewed = False
+        if not renewed:
+            lost.set()
+            return
 
-        mark_fired(reminder.id, now_iso)
-        delete_reminder(reminder.id)
 
+async def reminder_worker(bot: Bot, poll_interval: float | None = None) -> None:
+    """Send reminders while holding the leader lease.
 
-async def reminder_worker(bot: Bot, interval_seconds: int = 45) -> None:
-    while True:
-        await fire_due_reminders(bot)
-        await asyncio.sleep(interval_seconds)
+    The heap only knows reminders created in this process. When other
+    processes create reminders too, ``poll_interval`` makes the leader
+    also check the table on a timer.
+    """
+    leading = False
+    stale = False
+    try:
+        while True:
+            if not await run_write(acquire_lease, LEADER_LEASE, WORKER_ID, LEADER_LEASE_SECONDS):
+                leading = False
+                await asyncio.sleep(LEADER_RETRY_SECONDS)
+                continue
+
+            if not leading or stale:
+                scheduler.load(await run_read(get_active_reminders))
+                leading = True
+                stale = False
+
+            try:
+                await asyncio.wait_for(scheduler.wait_due(), poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            now = datetime.now(timezone.utc)
+            if scheduler.pop_due(now) or poll_interval is not None:
+                lost = asyncio.Event()
+                heartbeat = asyncio.create_task(_hold_lease(lost))
+                try:
+                    await fire_due_reminders(bot, now, stop=lost)
+                except Exception:
+                    # Due entries were already popped from the heap, so it is
+                    # rebuilt from the table before the next run.
+                    REMINDER_RUN_ERRORS.inc()
+                    logger.exception("Reminder run failed")
+                    stale = True
+                    await asyncio.sleep(LEADER_RETRY_SECONDS)
+                finally:
+                    heartbeat.cancel()
+                if lost.is_set():
+                    logger.warning("Lost the reminder lease during a run; stopped sending")
+                    leading = False
+    finally:
+        if leading:
+            # Let a standby process take over without waiting for expiry.
+            await run_write(release_lease, LEADER_LEASE, WORKER_ID)
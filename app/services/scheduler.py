@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+from datetime import datetime, timezone
+from typing import Iterable
+
+from app.schemas.reminder import Reminder
+
+
+def parse_fire_at(value: str) -> datetime:
+    fire_at = datetime.fromisoformat(value)
+    if fire_at.tzinfo is None:
+        fire_at = fire_at.replace(tzinfo=timezone.utc)
+    return fire_at
+
+
+class ReminderScheduler:
+    """In-memory min-heap of active reminders ordered by fire time.
+
+    Removed or rescheduled reminders are dropped lazily: the heap may hold
+    stale entries, which are skipped when they reach the top.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int]] = []
+        self._entries: dict[int, tuple[datetime, int, int]] = {}
+        self._by_task: dict[tuple[int, int], set[int]] = {}
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, reminders: Iterable[Reminder]) -> None:
+        self._heap.clear()
+        self._entries.clear()
+        self._by_task.clear()
+        for reminder in reminders:
+            fire_at = parse_fire_at(reminder.next_fire_at)
+            self._put(reminder.id, reminder.user_id, reminder.task_id, fire_at)
+            self._heap.append((fire_at, reminder.id))
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def add(self, reminder_id: int, user_id: int, task_id: int, fire_at: datetime) -> None:
+        head = self.next_fire_at()
+        self._put(reminder_id, user_id, task_id, fire_at)
+        heapq.heappush(self._heap, (fire_at, reminder_id))
+        if head is None or fire_at < head:
+            self._wakeup.set()
+
+    def remove(self, reminder_id: int) -> None:
+        entry = self._entries.pop(reminder_id, None)
+        if entry is None:
+            return
+        _, user_id, task_id = entry
+        ids = self._by_task.get((user_id, task_id))
+        if ids is not None:
+            ids.discard(reminder_id)
+            if not ids:
+                del self._by_task[(user_id, task_id)]
+
+    def remove_task(self, user_id: int, task_id: int) -> None:
+        for reminder_id in list(self._by_task.get((user_id, task_id), ())):
+            self.remove(reminder_id)
+
+    def next_fire_at(self) -> datetime | None:
+        while self._heap:
+            fire_at, reminder_id = self._heap[0]
+            entry = self._entries.get(reminder_id)
+            if entry is not None and entry[0] == fire_at:
+                return fire_at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: datetime) -> list[int]:
+        due: list[int] = []
+        while True:
+            fire_at = self.next_fire_at()
+            if fire_at is None or fire_at > now:
+                return due
+            _, reminder_id = heapq.heappop(self._heap)
+            self.remove(reminder_id)
+            due.append(reminder_id)
+
+    async def wait_due(self) -> None:
+        while True:
+            self._wakeup.clear()
+            fire_at = self.next_fire_at()
+            if fire_at is None:
+                timeout = None
+            else:
+                timeout = (fire_at - datetime.now(timezone.utc)).total_seconds()
+                if timeout <= 0:
+                    return
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return
+
+    def _put(self, reminder_id: int, user_id: int, task_id: int, fire_at: datetime) -> None:
+        self.remove(reminder_id)
+        self._entries[reminder_id] = (fire_at, user_id, task_id)
+        self._by_task.setdefault((user_id, task_id), set()).add(reminder_id)
+
+
+scheduler = ReminderScheduler()
@@ -1,28 +1,96 @@
-from app.db.tasks_repo import add_task, delete_task, get_tasks
+from bisect import bisect_left, bisect_right
+
+from app.db.database import run_read, run_write
+from app.db.tasks_repo import (
+    add_tasks,
+    delete_user_task,
+    delete_user_task_at,
+    get_tasks,
+    get_tasks_page,
+    has_more_tasks_than,
+)
 from app.llm.task_extractor import extract_tasks
-from app.schemas.task import TaskRecord
+from app.schemas.task import Task, TaskPage, TaskRecord
+from app.services.cache import task_cache
+from app.services.scheduler import scheduler
+
+PAGE_SIZE = 20
+# Longer lists are paged straight from SQLite instead of being cached whole.
+CACHED_LIST_MAX_TASKS = 1000
+
+
+def _slice_page(
+    records: list[TaskRecord],
+    after_id: int,
+    before_id: int | None,
+    limit: int,
+) -> TaskPage:
+    if before_id is None:
+        start = bisect_right(records, after_id, key=lambda record: record.id)
+        end = start + limit
+    else:
+        end = bisect_left(records, before_id, key=lambda record: record.id)
+        start = max(end - limit, 0)
+    return TaskPage(records=records[start:end], has_prev=start > 0, has_next=end < len(records))
 
 
-def create_tasks(user_id: int, text: str) -> list[TaskRecord]:
-    tasks = extract_tasks(text)
-    records: list[TaskRecord] = []
+async def create_tasks(user_id: int, text: str) -> list[TaskRecord]:
+    return await save_tasks(user_id, extract_tasks(text))
 
-    for task in tasks:
-        task_id = add_task(user_id, task)
-        records.append(TaskRecord(id=task_id, task=task))
 
+async def save_tasks(user_id: int, tasks: list[Task]) -> list[TaskRecord]:
+    if not tasks:
+        return []
+
+    task_ids = await run_write(add_tasks, user_id, tasks)
+    records = [TaskRecord(id=task_id, task=task) for task_id, task in zip(task_ids, tasks)]
+    task_cache.add(user_id, records)
     return records
 
 
-def list_tasks(user_id: int) -> list[TaskRecord]:
-    return get_tasks(user_id)
+async def list_tasks(user_id: int) -> list[TaskRecord]:
+    records = task_cache.get(user_id)
+    if records is not None:
+        return records
+    return await _load_tasks(user_id)
+
 
+async def _load_tasks(user_id: int) -> list[TaskRecord]:
+    version = task_cache.version(user_id)
+    records = await run_read(get_tasks, user_id)
+    task_cache.set(user_id, records, version)
+    return records
+
+
+async def list_tasks_page(
+    user_id: int,
+    after_id: int = 0,
+    before_id: int | None = None,
+    limit: int = PAGE_SIZE,
+) -> TaskPage:
+    if not task_cache.enabled:
+        # A loaded list would be thrown away at once; read just the page.
+        return await run_read(get_tasks_page, user_id, after_id, before_id, limit)
+
+    records = task_cache.get(user_id)
+    if records is None:
+        if await run_read(has_more_tasks_than, user_id, CACHED_LIST_MAX_TASKS):
+            return await run_read(get_tasks_page, user_id, after_id, before_id, limit)
+        records = await _load_tasks(user_id)
+    return _slice_page(records, after_id, before_id, limit)
+
+
+async def delete_task_by_id(user_id: int, task_id: int) -> TaskRecord | None:
+    record = await run_write(delete_user_task, user_id, task_id)
+    if record is not None:
+        task_cache.discard(user_id, record.id)
+        scheduler.remove_task(user_id, record.id)
+    return record
 
-def delete_task_by_index(user_id: int, index: int) -> TaskRecord | None:
-    tasks = get_tasks(user_id)
-    if not (0 <= index < len(tasks)):
-        return None
 
-    record = tasks[index]
-    delete_task(record.id)
+async def delete_task_by_index(user_id: int, index: int) -> TaskRecord | None:
+    record = await run_write(delete_user_task_at, user_id, index)
+    if record is not None:
+        task_cache.discard(user_id, record.id)
+        scheduler.remove_task(user_id, record.id)
     return record
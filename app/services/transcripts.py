@@ -0,0 +1,22 @@
+import hashlib
+
+from app.db.database import run_write
+from app.db.transcripts_repo import get_transcript, save_transcript
+
+TRANSCRIPT_CACHE_SIZE = 10_000
+
+
+def voice_key(file_unique_id: str) -> str:
+    return f"tg:{file_unique_id}"
+
+
+def audio_key(data: bytes) -> str:
+    return f"sha256:{hashlib.sha256(data).hexdigest()}"
+
+
+async def get_cached_transcript(key: str) -> str | None:
+    return await run_write(get_transcript, key)
+
+
+async def cache_transcript(keys: list[str], text: str) -> None:
+    await run_write(save_transcript, keys, text, TRANSCRIPT_CACHE_SIZE)
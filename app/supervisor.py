@@ -0,0 +1,224 @@
+"""Sharded mode: one process polls Telegram, worker processes handle updates.
+
+Every update goes to the worker picked by its sender's user id, so one
+user's updates are handled in order by the same process, and that
+process's task cache and pending voice previews stay authoritative for
+the user. Workers answer through the Bot API themselves.
+
+    python -m app.supervisor
+
+SIGHUP restarts the workers one at a time without dropping updates;
+a worker that dies is started again. Each worker runs SHARD_ASR_WORKERS
+Whisper processes (1 by default) instead of ASR_WORKERS.
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+import signal
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable
+
+from aiogram import Bot
+
+from app.asr.service import transcriber
+from app.bot.main import create_bot, create_dispatcher, start_services, stop_services
+from app.config import REMINDER_POLL_SECONDS, SHARD_ASR_WORKERS, SHARD_CONCURRENCY, SHARD_WORKERS
+from app.db.database import close_db, init_db
+
+POLL_TIMEOUT_SECONDS = 30
+MONITOR_INTERVAL_SECONDS = 1.0
+STOP_TIMEOUT_SECONDS = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+def sender_id(update: dict[str, Any]) -> int | None:
+    for value in update.values():
+        if isinstance(value, dict):
+            sender = value.get("from") or value.get("user")
+            if isinstance(sender, dict) and "id" in sender:
+                return sender["id"]
+    return None
+
+
+def shard_of(update: dict[str, Any], shards: int) -> int:
+    user_id = sender_id(update)
+    if user_id is None:
+        user_id = update.get("update_id", 0)
+    return user_id % shards
+
+
+def _forget(tails: dict, key: Any, task: asyncio.Task) -> None:
+    if tails.get(key) is task:
+        del tails[key]
+
+
+async def _run_worker(index: int, updates: multiprocessing.Queue, bot_factory: Callable[[], Bot]) -> None:
+    # A user's voice notes are handled by their shard, so every shard needs
+    # a pool; it is sized separately, as ASR_WORKERS models per shard
+    # would multiply by SHARD_WORKERS.
+    transcriber.workers = SHARD_ASR_WORKERS
+    bot = bot_factory()
+    dp = create_dispatcher()
+    services = await start_services(bot, REMINDER_POLL_SECONDS)
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(SHARD_CONCURRENCY)
+    # Last queued task per user: a user's next update waits for it, updates
+    # of different users run concurrently.
+    tails: dict[Any, asyncio.Task] = {}
+
+    async def handle(update: dict[str, Any], previous: asyncio.Task | None) -> None:
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+            await dp.feed_raw_update(bot, update)
+        except Exception:
+            logger.exception("Shard %s failed to handle update %s", index, update.get("update_id"))
+        finally:
+            slots.release()
+
+    logger.info("Shard worker %s ready", index)
+    try:
+        while True:
+            update = await loop.run_in_executor(None, updates.get)
+            if update is None:
+                break
+            await slots.acquire()
+            key = sender_id(update)
+            task = asyncio.create_task(handle(update, tails.get(key)))
+            tails[key] = task
+            task.add_done_callback(functools.partial(_forget, tails, key))
+
+        if tails:
+            await asyncio.wait(list(tails.values()))
+    finally:
+        await stop_services(bot, services)
+        close_db()
+
+
+def _worker_main(index: int, updates: multiprocessing.Queue, bot_factory: Callable[[], Bot]) -> None:
+    # The supervisor decides when workers stop; Ctrl+C must not kill them
+    # with updates still queued.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_run_worker(index, updates, bot_factory))
+
+
+class Supervisor:
+    def __init__(self, workers: int = SHARD_WORKERS, bot_factory: Callable[[], Bot] = create_bot) -> None:
+        self.bot_factory = bot_factory
+        self._context = multiprocessing.get_context("spawn")
+        # A worker's queue outlives the process, so updates that arrive
+        # while it restarts wait for its successor, in order.
+        self.queues = [self._context.Queue() for _ in range(workers)]
+        self.processes: list[BaseProcess | None] = [None] * workers
+        self._restarting: set[int] = set()
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, self.queues[index], self.bot_factory),
+            name=f"shard-{index}",
+        )
+        process.start()
+        self.processes[index] = process
+
+    def start(self) -> None:
+        for index in range(len(self.queues)):
+            self._spawn(index)
+
+    def dispatch(self, update: dict[str, Any]) -> None:
+        self.queues[shard_of(update, len(self.queues))].put(update)
+
+    async def _stop_worker(self, index: int) -> None:
+        process = self.processes[index]
+        if process is None:
+            return
+        if process.is_alive():
+            # The sentinel is queued behind pending updates, so they are
+            # handled before the worker exits.
+            self.queues[index].put(None)
+            await asyncio.to_thread(process.join, STOP_TIMEOUT_SECONDS)
+        if process.is_alive():
+            logger.warning("Shard worker %s did not stop in time, terminating", index)
+            process.terminate()
+            await asyncio.to_thread(process.join)
+        self.processes[index] = None
+
+    async def restart(self, index: int) -> None:
+        self._restarting.add(index)
+        try:
+            await self._stop_worker(index)
+            self._spawn(index)
+        finally:
+            self._restarting.discard(index)
+
+    async def restart_all(self) -> None:
+        for index in range(len(self.queues)):
+            await self.restart(index)
+        logger.info("All shard workers restarted")
+
+    async def monitor(self) -> None:
+        while True:
+            await asyncio.sleep(MONITOR_INTERVAL_SECONDS)
+            for index, process in enumerate(self.processes):
+                if index in self._restarting or process is None or process.is_alive():
+                    continue
+                # A worker killed inside Queue.get() keeps the queue's read
+                # lock forever, so its successor gets a new queue and the
+                # updates still waiting in the old one are lost.
+                logger.warning(
+                    "Shard worker %s exited with %s, restarting with a new queue", index, process.exitcode
+                )
+                self.queues[index] = self._context.Queue()
+                self._spawn(index)
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(self._stop_worker(index) for index in range(len(self.queues))))
+
+
+async def poll_updates(bot: Bot, supervisor: Supervisor, allowed_updates: list[str]) -> None:
+    offset = None
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset,
+                timeout=POLL_TIMEOUT_SECONDS,
+                allowed_updates=allowed_updates,
+                request_timeout=POLL_TIMEOUT_SECONDS + 10,
+            )
+        except Exception:
+            logger.exception("Failed to fetch updates")
+            await asyncio.sleep(1)
+            continue
+
+        for update in updates:
+            supervisor.dispatch(update.model_dump(mode="json", exclude_none=True, by_alias=True))
+            offset = update.update_id + 1
+
+
+async def main():
+    # Migrations run once here; every worker opens its own connections.
+    init_db()
+    close_db()
+
+    supervisor = Supervisor()
+    supervisor.start()
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.create_task(supervisor.restart_all()))
+    except (AttributeError, NotImplementedError):
+        pass
+
+    bot = create_bot()
+    monitor = asyncio.create_task(supervisor.monitor())
+    try:
+        await poll_updates(bot, supervisor, create_dispatcher().resolve_used_update_types())
+    finally:
+        monitor.cancel()
+        await supervisor.stop()
+        await bot.session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
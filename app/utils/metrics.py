@@ -0,0 +1,200 @@
+"""In-process counters and histograms rendered in the Prometheus text format.
+
+Every process keeps its own values. A single webhook process serves them
+on ``/metrics``; several workers sharing the port do not, since a scrape
+would reach a random one, and are read through METRICS_FILE, where a
+``{pid}`` gives each process its own dump.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Seconds, from a cached SQLite read up to a Whisper pass over a long note.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger(__name__)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        # Without labels the single series is reported from the start, as 0.
+        self._values: dict[tuple[str, ...], float] = {} if labelnames else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: a count per bucket (the last one is +Inf), then the sum.
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        if not labelnames:
+            self._values[()] = ([0] * (len(self.buckets) + 1), [0.0])
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                item = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            item[0][index] += 1
+            item[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        item = self._values.get(tuple(str(labels[name]) for name in self.labelnames))
+        return sum(item[0]) if item is not None else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_number(float(bound))}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_number(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+_registry: dict[str, Counter | Histogram] = {}
+
+
+def counter(name: str, description: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    metric = _registry.setdefault(name, Counter(name, description, labelnames))
+    if not isinstance(metric, Counter):
+        raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+    return metric
+
+
+def histogram(
+    name: str,
+    description: str,
+    labelnames: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+) -> Histogram:
+    metric = _registry.setdefault(name, Histogram(name, description, labelnames, buckets))
+    if not isinstance(metric, Histogram):
+        raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+    return metric
+
+
+def timed(metric: Histogram, **labels: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator recording each call's duration, labelled ``query=<name>``."""
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> T:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - started, query=func.__name__, **labels)
+
+        return wrapper
+
+    return decorator
+
+
+def render() -> str:
+    lines: list[str] = []
+    for name in sorted(_registry):
+        metric = _registry[name]
+        lines.append(f"# HELP {name} {metric.description}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+def dump(path: str) -> None:
+    # Written next to the target and renamed, so readers never see half a file.
+    path = path.replace("{pid}", str(os.getpid()))
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        file.write(render())
+    os.replace(temporary, path)
+
+
+async def metrics_dumper(path: str, interval: float) -> None:
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(dump, path)
+            except OSError:
+                logger.exception("Failed to write metrics to %s", path)
+    finally:
+        try:
+            dump(path)
+        except OSError:
+            pass
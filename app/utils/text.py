@@ -0,0 +1,4 @@
+def shorten(text: str, limit: int = 40) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit - 3]}..."
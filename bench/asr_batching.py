@@ -0,0 +1,77 @@
+"""Clips/second of batched vs unbatched ASR inference on synthetic audio.
+
+    python -m bench.asr_batching --clips 32 --batch-size 8 --backend whisper --model tiny
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.asr.backends import SAMPLE_RATE, AsrSettings, create_backend
+
+
+def synthetic_clips(count: int, min_seconds: float, max_seconds: float, seed: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    clips = []
+    for _ in range(count):
+        length = int(rng.uniform(min_seconds, max_seconds) * SAMPLE_RATE)
+        t = np.arange(length, dtype=np.float32) / SAMPLE_RATE
+        tone = 0.1 * np.sin(2 * np.pi * rng.uniform(120, 300) * t)
+        noise = 0.01 * rng.standard_normal(length)
+        clips.append((tone + noise).astype(np.float32))
+    return clips
+
+
+def measure(run, clips: list[np.ndarray]) -> float:
+    started = time.perf_counter()
+    run(clips)
+    return len(clips) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", default="whisper")
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--clips", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--min-seconds", type=float, default=2.0)
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    backend = create_backend(AsrSettings(backend=args.backend, model_name=args.model, threads=args.threads))
+    backend.load()
+    backend.warm_up()
+    clips = synthetic_clips(args.clips, args.min_seconds, args.max_seconds, args.seed)
+
+    def unbatched(items: list[np.ndarray]) -> None:
+        for audio in items:
+            backend.transcribe(audio)
+
+    def batched(items: list[np.ndarray]) -> None:
+        ordered = sorted(items, key=len)
+        for start in range(0, len(ordered), args.batch_size):
+            backend.transcribe_batch(ordered[start:start + args.batch_size])
+
+    unbatched_rate = measure(unbatched, clips)
+    batched_rate = measure(batched, clips)
+    print(
+        json.dumps(
+            {
+                "benchmark": "asr_batching",
+                "backend": args.backend,
+                "model": args.model,
+                "clips": args.clips,
+                "batch_size": args.batch_size,
+                "unbatched_clips_per_second": round(unbatched_rate, 3),
+                "batched_clips_per_second": round(batched_rate, 3),
+                "speedup": round(batched_rate / unbatched_rate, 3),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Phrases/second of the date parser, optionally over a real message dump.
+
+    python -m bench.date_parsing --repeat 5000
+    python -m bench.date_parsing --input messages.txt --check 20000
+
+``--input`` reads one message per line. Before timing, ``--check N``
+(default 2000, 0 skips) generated cases per property are run through the
+parser: a weekday phrase falls 1-7 days ahead on that weekday, "через N
+дней" is today + N, a valid dd.mm[.yyyy] or "12 мая [2027]" date comes
+back unchanged (a yearless one within a year of today), and on phrases in
+the old grammar (сегодня/завтра/послезавтра, dd.mm) the parser agrees
+with the one it replaced, except that a dd.mm already past means next
+year. Failures are printed and the exit status
+is 1.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from app.dates.parser import parse_date, parse_date_time
+from bench.task_extraction import _legacy_parse_date
+
+CORPUS = (
+    "купить молоко",
+    "сдать отчёт завтра",
+    "послезавтра сходить в спортзал",
+    "позвонить маме в пятницу",
+    "во вторник встреча с командой",
+    "через 3 дня продлить страховку",
+    "через неделю записаться к врачу",
+    "через два месяца заменить фильтр",
+    "созвон в 18:30",
+    "завтра в 9:00 стоматолог",
+    "оплатить квартиру 25.10",
+    "подать документы 01.12.2026",
+    "день рождения Саши 12 мая",
+    "отпуск с 1 января 2027 года",
+    "полить цветы",
+    "забрать посылку к 19:00",
+)
+
+_WORDS = (
+    "в", "во", "к", "через", "завтра", "сегодня", "пятницу", "среду", "дня",
+    "недели", "месяц", "мая", "декабря", "года", "купить", "и", ".", ":", "/",
+)
+
+
+def random_phrase(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 6)):
+        roll = rng.random()
+        if roll < 0.4:
+            parts.append(rng.choice(_WORDS))
+        elif roll < 0.8:
+            parts.append(str(rng.randint(0, 99)) + rng.choice(("", ".", ":", "/")) + str(rng.randint(0, 9999)))
+        else:
+            parts.append(str(rng.randint(0, 40)))
+    return " ".join(parts)
+
+
+_FILLER = ("купить", "молоко", "позвонить", "маме", "сдать", "отчёт", "встреча", "с", "командой")
+
+_WEEKDAY_NAMES = ("понедельник", "вторник", "среду", "четверг", "пятницу", "субботу", "воскресенье")
+
+_MONTH_NAMES = (
+    "января", "февраля", "марта", "апреля", "мая", "июня",
+    "июля", "августа", "сентября", "октября", "ноября", "декабря",
+)
+
+
+def _random_day(rng: random.Random, first: date, last: date) -> date:
+    return first + timedelta(days=rng.randint(0, (last - first).days))
+
+
+def _next_year(value: date) -> date | None:
+    try:
+        return value.replace(year=value.year + 1)
+    except ValueError:
+        return None
+
+
+def _around(rng: random.Random, token: str) -> str:
+    before = rng.sample(_FILLER, rng.randint(0, 2))
+    after = rng.sample(_FILLER, rng.randint(0, 2))
+    return " ".join([*before, token, *after])
+
+
+def check(count: int, seed: int) -> list[str]:
+    """Run ``count`` generated cases per property; return the failures."""
+    rng = random.Random(seed)
+    failures: list[str] = []
+
+    def expect(phrase: str, today: date, actual: object, expected: object) -> None:
+        if actual != expected:
+            failures.append(f"{phrase!r} on {today}: {actual!r}, expected {expected!r}")
+
+    for _ in range(count):
+        today = _random_day(rng, date(2000, 1, 1), date(2099, 12, 31))
+        weekday = rng.randrange(7)
+        preposition = "во" if weekday == 1 else "в"
+        phrase = _around(rng, f"{preposition} {_WEEKDAY_NAMES[weekday]}")
+        due = parse_date(phrase, today)
+        if due is None or due.weekday() != weekday or not 1 <= (due - today).days <= 7:
+            failures.append(f"{phrase!r} on {today}: {due!r}, expected a weekday {weekday} 1-7 days ahead")
+
+        days = rng.randint(0, 999)
+        phrase = _around(rng, f"через {days} {rng.choice(('дней', 'дня', 'день'))}")
+        expect(phrase, today, parse_date(phrase, today), today + timedelta(days=days))
+
+        # Without a year the date is the next one from today on; within a
+        # year of today that is the date the phrase was made from.
+        style = rng.randrange(3)
+        if style:
+            value = _random_day(rng, date(2000, 1, 1), date(2099, 12, 31))
+        else:
+            value = _random_day(rng, today, today + timedelta(days=364))
+        separator = rng.choice("./")
+        token = f"{value.day:0{rng.randint(1, 2)}}{separator}{value.month:02}"
+        if style:
+            token += separator + (str(value.year) if style == 1 else f"{value.year % 100:02}")
+        phrase = _around(rng, token)
+        expect(phrase, today, parse_date(phrase, today), value)
+
+        token = f"{value.day} {_MONTH_NAMES[value.month - 1]}"
+        if style:
+            token += f" {value.year}" + rng.choice(("", " год", " года"))
+        phrase = _around(rng, token)
+        expect(phrase, today, parse_date(phrase, today), value)
+
+    # The old parser only knew relative words and dd.mm, and always used
+    # the real today and its year; a dd.mm already past now means next year.
+    today = date.today()
+    for _ in range(count):
+        roll = rng.randrange(4)
+        if roll == 0:
+            token = rng.choice(("сегодня", "завтра", "послезавтра", "Завтра"))
+        elif roll == 1:
+            token = f"{rng.randint(0, 39)}{rng.choice('./')}{rng.randint(0, 19)}"
+        else:
+            token = rng.choice(_FILLER)
+        phrase = _around(rng, token)
+        expected = _legacy_parse_date(phrase)
+        if roll == 1 and expected is not None and expected < today:
+            expected = _next_year(expected)
+        expect(phrase, today, parse_date(phrase, today), expected)
+
+    # Arbitrary token soup must not raise, and a time alone means today.
+    today = date(2026, 1, 1)
+    for _ in range(count):
+        phrase = random_phrase(rng)
+        due, at = parse_date_time(phrase, today)
+        if at is not None and due is None:
+            failures.append(f"{phrase!r} has a time without a date")
+    return failures
+
+
+def measure(phrases: list[str], today: date, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for text in phrases:
+            parse_date_time(text, today)
+        best = min(best, time.perf_counter() - started)
+    return len(phrases) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input")
+    parser.add_argument("--repeat", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--check", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as file:
+            phrases = [line.strip() for line in file if line.strip()]
+    else:
+        phrases = list(CORPUS) * args.repeat
+
+    failures = check(args.check, args.seed) if args.check else []
+    for failure in failures[:20]:
+        print(failure, file=sys.stderr)
+
+    today = date.today()
+    dated = sum(parse_date_time(text, today)[0] is not None for text in phrases)
+    rate = measure(phrases, today, args.rounds)
+    result = {
+        "benchmark": "date_parsing",
+        "phrases": len(phrases),
+        "dated": dated,
+        "phrases_per_second": round(rate, 1),
+    }
+    if args.check:
+        result.update(checked=args.check, failures=len(failures))
+    print(json.dumps(result))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Latency of the real dispatcher and handlers, end to end, against a fake Bot API.
+
+    python -m bench.end_to_end
+    python -m bench.end_to_end --only list,storm --storm 10000
+    python -m bench.end_to_end > baseline.json
+    python -m bench.end_to_end --baseline baseline.json --tolerance 0.2
+
+Updates go one at a time through ``create_dispatcher()`` and its routers
+into a temporary SQLite database, so latency is the time from
+``feed_raw_update`` to the handler's last reply. The reminder storm marks
+``--storm`` rows due and times one ``fire_due_reminders`` run with the
+Telegram rate limits lifted; its percentiles are the time until a message
+was sent.
+
+Prints one JSON line. With ``--baseline`` (a previous run's output), the
+exit status is 1 when a scenario's throughput drops by more than
+``--tolerance`` against it.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from bench.fake_telegram import FAKE_TOKEN, callback_update, create_fake_bot, text_update
+
+os.environ.setdefault("BOT_TOKEN", FAKE_TOKEN)
+os.environ["ASR_WORKERS"] = "0"
+
+from aiogram import Bot, Dispatcher  # noqa: E402
+from aiogram.methods import SendMessage  # noqa: E402
+
+from app.bot.main import create_dispatcher  # noqa: E402
+from app.db.database import close_db, get_connection, init_db, run_read, run_write  # noqa: E402
+from app.db.tasks_repo import add_task_rows, get_tasks  # noqa: E402
+from app.services.delivery import RateLimiter  # noqa: E402
+from app.services.reminders import fire_due_reminders  # noqa: E402
+
+SCENARIOS = ("text_add", "list", "done", "remind", "storm")
+
+TEXTS = (
+    "купить молоко и хлеб завтра",
+    "позвонить маме в пятницу",
+    "сдать отчёт 12.05 и оплатить интернет",
+    "записаться к врачу через 3 дня",
+)
+
+# Disjoint user id ranges, so scenarios never see each other's tasks.
+TEXT_USERS = 1_000_000
+LIST_USERS = 2_000_000
+DONE_USER = 3_000_000
+REMIND_USERS = 4_000_000
+STORM_USERS = 5_000_000
+
+_update_ids = itertools.count(1)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarize(latencies: list[float], elapsed: float | None = None) -> dict:
+    ordered = sorted(latencies)
+    elapsed = sum(latencies) if elapsed is None else elapsed
+    return {
+        "count": len(ordered),
+        "per_second": round(len(ordered) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+async def feed(dp: Dispatcher, bot: Bot, update: dict) -> float:
+    started = time.perf_counter()
+    await dp.feed_raw_update(bot, update)
+    return time.perf_counter() - started
+
+
+async def seed_tasks(user_ids: list[int], per_user: int) -> dict[int, list[int]]:
+    rows = [(user_id, f"задача {number}", None) for user_id in user_ids for number in range(per_user)]
+    await run_write(add_task_rows, rows)
+    return {user_id: [record.id for record in await run_read(get_tasks, user_id)] for user_id in user_ids}
+
+
+async def bench_text_add(dp: Dispatcher, bot: Bot, args: argparse.Namespace) -> dict:
+    latencies = []
+    for number in range(args.messages):
+        user_id = TEXT_USERS + number % args.users
+        latencies.append(await feed(dp, bot, text_update(next(_update_ids), user_id, TEXTS[number % len(TEXTS)])))
+    return {"text_add": summarize(latencies)}
+
+
+async def bench_list(dp: Dispatcher, bot: Bot, args: argparse.Namespace) -> dict:
+    results = {}
+    for size in args.list_sizes:
+        user_id = LIST_USERS + size
+        await seed_tasks([user_id], size)
+        latencies = [
+            await feed(dp, bot, text_update(next(_update_ids), user_id, "/list"))
+            for _ in range(args.repeat)
+        ]
+        results[f"list_{size}"] = summarize(latencies)
+    return results
+
+
+async def bench_done(dp: Dispatcher, bot: Bot, args: argparse.Namespace) -> dict:
+    # Half the tasks go by number, the other half through the inline buttons.
+    task_ids = (await seed_tasks([DONE_USER], 2 * args.repeat))[DONE_USER]
+    by_index = [
+        await feed(dp, bot, text_update(next(_update_ids), DONE_USER, "/done 1"))
+        for _ in range(args.repeat)
+    ]
+    by_button = [
+        await feed(dp, bot, callback_update(next(_update_ids), DONE_USER, f"done:{task_id}"))
+        for task_id in task_ids[args.repeat:]
+    ]
+    return {"done_index": summarize(by_index), "done_button": summarize(by_button)}
+
+
+async def bench_remind(dp: Dispatcher, bot: Bot, args: argparse.Namespace) -> dict:
+    # One flow is /remind, a tap on a task and the time; latency covers all three.
+    user_ids = [REMIND_USERS + number for number in range(args.users)]
+    tasks = await seed_tasks(user_ids, 1)
+    latencies = []
+    for number in range(args.repeat):
+        user_id = user_ids[number % len(user_ids)]
+        elapsed = await feed(dp, bot, text_update(next(_update_ids), user_id, "/remind"))
+        elapsed += await feed(dp, bot, callback_update(next(_update_ids), user_id, f"remind_task:{tasks[user_id][0]}"))
+        elapsed += await feed(dp, bot, text_update(next(_update_ids), user_id, "09:30"))
+        latencies.append(elapsed)
+    return {"remind_flow": summarize(latencies)}
+
+
+def _insert_due_reminders(rows: list[tuple[int, int]], due_iso: str) -> None:
+    created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with get_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO reminders (
+                user_id, task_id, time_hhmm, next_fire_at, is_active, created_at, last_fired_at
+            ) VALUES (?, ?, '09:00', ?, 1, ?, NULL)
+            """,
+            [(user_id, task_id, due_iso, created_at) for user_id, task_id in rows],
+        )
+
+
+async def bench_storm(dp: Dispatcher, bot: Bot, args: argparse.Namespace) -> dict:
+    users = max(args.storm // 10, 1)
+    rows = [(STORM_USERS + number % users, f"задача {number}", None) for number in range(args.storm)]
+    await run_write(add_task_rows, rows)
+    with get_connection() as conn:
+        pairs = conn.execute(
+            "SELECT user_id, id FROM tasks WHERE user_id >= ? ORDER BY id",
+            (STORM_USERS,),
+        ).fetchall()
+    due_iso = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat(timespec="seconds")
+    await run_write(_insert_due_reminders, pairs, due_iso)
+
+    sent_at: list[float] = []
+    storm_bot = create_fake_bot(
+        lambda method: sent_at.append(time.perf_counter()) if isinstance(method, SendMessage) else None
+    )
+    # The real limits would make 100k messages take an hour; the bench
+    # measures everything around them.
+    started = time.perf_counter()
+    stats = await fire_due_reminders(storm_bot, limiter=RateLimiter(global_rate=1e9, per_chat_rate=1e9))
+    elapsed = time.perf_counter() - started
+
+    with get_connection() as conn:
+        remaining = conn.execute("SELECT COUNT(*) FROM reminders WHERE user_id >= ?", (STORM_USERS,)).fetchone()[0]
+
+    result = summarize([moment - started for moment in sent_at] or [elapsed], elapsed)
+    result.update(
+        rows=len(pairs),
+        sent=stats.sent,
+        failed=stats.failed,
+        remaining=remaining,
+        seconds=round(elapsed, 3),
+    )
+    return {"reminder_storm": result}
+
+
+RUNNERS = {
+    "text_add": bench_text_add,
+    "list": bench_list,
+    "done": bench_done,
+    "remind": bench_remind,
+    "storm": bench_storm,
+}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    init_db()
+    bot = create_fake_bot()
+    dp = create_dispatcher()
+    try:
+        # The first update pays for imports and statement preparation.
+        await feed(dp, bot, text_update(next(_update_ids), TEXT_USERS - 1, "разогрев"))
+        results = {}
+        for name in args.only:
+            results.update(await RUNNERS[name](dp, bot, args))
+        return results
+    finally:
+        await bot.session.close()
+        close_db()
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    found = []
+    for name, previous in baseline.get("scenarios", {}).items():
+        current = results.get(name)
+        if not current or not previous.get("per_second") or not current.get("per_second"):
+            continue
+        if current["per_second"] < previous["per_second"] * (1 - tolerance):
+            found.append(name)
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", default=",".join(SCENARIOS))
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--list-sizes", default="10,1000,10000")
+    parser.add_argument("--storm", type=int, default=100_000)
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    args.only = [name for name in args.only.split(",") if name]
+    unknown = set(args.only) - set(RUNNERS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    args.list_sizes = [int(value) for value in args.list_sizes.split(",")]
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # The database path is relative to the working directory.
+        os.chdir(directory)
+        try:
+            results = asyncio.run(run(args))
+        finally:
+            os.chdir(cwd)
+
+    output = {"benchmark": "end_to_end", "scenarios": results}
+    failed = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            failed = regressions(results, json.load(file), args.tolerance)
+        output["regressions"] = failed
+    print(json.dumps(output, ensure_ascii=False))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""A Bot API session that answers locally instead of calling Telegram."""
+from __future__ import annotations
+
+import itertools
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Callable
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import EditMessageText, GetMe, SendMessage, TelegramMethod
+from aiogram.types import Chat, Message, User
+
+FAKE_TOKEN = "123456:fake-token-for-benchmarks"
+
+
+class FakeSession(BaseSession):
+    """Records every API call; sendMessage and editMessageText return messages."""
+
+    def __init__(self, on_call: Callable[[TelegramMethod], None] | None = None) -> None:
+        super().__init__()
+        self.calls: Counter[str] = Counter()
+        self.on_call = on_call
+        self._message_ids = itertools.count(1)
+
+    async def make_request(self, bot: Bot, method: TelegramMethod, timeout: int | None = None) -> Any:
+        self.calls[type(method).__name__] += 1
+        if self.on_call is not None:
+            self.on_call(method)
+
+        if isinstance(method, (SendMessage, EditMessageText)):
+            return Message(
+                message_id=method.message_id if isinstance(method, EditMessageText) else next(self._message_ids),
+                date=datetime.now(timezone.utc),
+                chat=Chat(id=method.chat_id or 0, type="private"),
+                text=method.text,
+            )
+        if isinstance(method, GetMe):
+            return User(id=123456, is_bot=True, first_name="bench")
+        return True
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: dict[str, Any] | None = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        raise NotImplementedError("The fake session serves no files")
+        yield b""
+
+    async def close(self) -> None:
+        pass
+
+
+def create_fake_bot(on_call: Callable[[TelegramMethod], None] | None = None) -> Bot:
+    return Bot(token=FAKE_TOKEN, session=FakeSession(on_call))
+
+
+def text_update(update_id: int, user_id: int, text: str) -> dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(datetime.now(timezone.utc).timestamp()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "bench"},
+            "text": text,
+        },
+    }
+
+
+def callback_update(update_id: int, user_id: int, data: str, message_id: int = 1) -> dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": {"id": user_id, "is_bot": False, "first_name": "bench"},
+            "chat_instance": str(user_id),
+            "data": data,
+            "message": {
+                "message_id": message_id,
+                "date": int(datetime.now(timezone.utc).timestamp()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": 123456, "is_bot": True, "first_name": "bench"},
+                "text": "bench",
+            },
+        },
+    }
@@ -0,0 +1,115 @@
+"""Messages/second through the sharded supervisor for several worker counts.
+
+    python -m bench.sharding --messages 2000 --users 200 --workers 1,2,4
+
+Runs against a temporary database and a fake Bot API, so it needs neither
+a token nor network access. Every message is a plain-text task and counts
+as handled once its worker has sent the reply.
+"""
+import argparse
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from bench.fake_telegram import FAKE_TOKEN, create_fake_bot, text_update
+
+os.environ.setdefault("BOT_TOKEN", FAKE_TOKEN)
+os.environ["ASR_WORKERS"] = "0"
+
+from aiogram import Bot  # noqa: E402
+from aiogram.methods import SendMessage  # noqa: E402
+
+from app.db.database import close_db, init_db  # noqa: E402
+from app.supervisor import Supervisor  # noqa: E402
+
+TEXTS = (
+    "купить молоко и хлеб завтра",
+    "позвонить маме в пятницу",
+    "сдать отчёт 12.05 и оплатить интернет",
+    "записаться к врачу через 3 дня",
+)
+
+
+def counting_bot(counter) -> Bot:
+    def on_call(method) -> None:
+        if isinstance(method, SendMessage):
+            with counter.get_lock():
+                counter.value += 1
+
+    return create_fake_bot(on_call)
+
+
+async def wait_for(counter, target: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while counter.value < target:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"handled {counter.value} of {target} messages")
+        await asyncio.sleep(0.01)
+
+
+async def run(workers: int, messages: int, users: int, timeout: float) -> float:
+    context = multiprocessing.get_context("spawn")
+    counter = context.Value("q", 0)
+    supervisor = Supervisor(workers, bot_factory=functools.partial(counting_bot, counter))
+    supervisor.start()
+    try:
+        # One message per shard, so every worker is up before timing starts.
+        for user_id in range(workers):
+            supervisor.dispatch(text_update(user_id, user_id, "разогрев"))
+        await wait_for(counter, workers, timeout)
+
+        baseline = counter.value
+        started = time.perf_counter()
+        for update_id in range(messages):
+            user_id = 1000 + update_id % users
+            supervisor.dispatch(text_update(10_000 + update_id, user_id, TEXTS[update_id % len(TEXTS)]))
+        await wait_for(counter, baseline + messages, timeout)
+        return messages / (time.perf_counter() - started)
+    finally:
+        await supervisor.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--workers", default=",".join(str(2 ** i) for i in range((os.cpu_count() or 1).bit_length())))
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    results = []
+    cwd = os.getcwd()
+    for workers in [int(value) for value in args.workers.split(",")]:
+        with tempfile.TemporaryDirectory() as directory:
+            # Workers inherit the directory, and with it the relative DB path.
+            os.chdir(directory)
+            try:
+                init_db()
+                close_db()
+                rate = asyncio.run(run(workers, args.messages, args.users, args.timeout))
+            finally:
+                os.chdir(cwd)
+        results.append({"workers": workers, "messages_per_second": round(rate, 1)})
+
+    base = results[0]["messages_per_second"]
+    for result in results:
+        result["scaling"] = round(result["messages_per_second"] / base, 3)
+    print(
+        json.dumps(
+            {
+                "benchmark": "sharding",
+                "cpu_count": os.cpu_count(),
+                "messages": args.messages,
+                "users": args.users,
+                "results": results,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Messages/second of the task extractor against the previous implementation.
+
+    python -m bench.task_extraction --repeat 2000 --rounds 5
+
+Besides the whole corpus, the messages with and without a due date are
+timed separately: the two paths cost very different amounts.
+"""
+import argparse
+import json
+import re
+import time
+from datetime import date, timedelta
+
+from app.llm.task_extractor import extract_tasks
+from app.schemas.task import Task
+
+CORPUS = (
+    "купить молоко",
+    "купить молоко и хлеб завтра",
+    "Завтра позвонить маме и записаться к врачу 12.05",
+    "сдать отчёт сегодня, оплатить интернет и забрать посылку послезавтра",
+    "приготовить завтрак и помыть посуду",
+    "встреча с командой 03/11 и подготовить презентацию",
+    "заплатить за квартиру 25.10; продлить страховку",
+    "послезавтра сходить в спортзал и купить кроссовки",
+    "  полить цветы  и   вынести мусор сегодня  ",
+    "Написать Сергею про проект, и отправить договор завтра.",
+    "записать ребёнка в секцию 1.09 и купить форму 30.08",
+    "проверить почту",
+    "забронировать столик на вечер пятницы и купить цветы",
+    "сегодня закончить ревью и завтра смержить ветку и 15.11 выкатить релиз",
+)
+
+
+def _legacy_parse_date(text: str) -> date | None:
+    text = text.lower()
+    today = date.today()
+    if "сегодня" in text:
+        return today
+    if "послезавтра" in text:
+        return today + timedelta(days=2)
+    if "завтра" in text:
+        return today + timedelta(days=1)
+    match = re.search(r"(\d{1,2})[./](\d{1,2})", text)
+    if match:
+        day, month = map(int, match.groups())
+        try:
+            return date(today.year, month, day)
+        except ValueError:
+            return None
+    return None
+
+
+def _legacy_strip_date_tokens(text: str) -> str:
+    clean = re.sub(r"\b(сегодня|завтра|послезавтра)\b", "", text, flags=re.IGNORECASE)
+    clean = re.sub(r"\b\d{1,2}[./]\d{1,2}\b", "", clean)
+    clean = " ".join(clean.split())
+    return clean.strip(" ,.;:")
+
+
+def legacy_extract_tasks(text: str) -> list[Task]:
+    """The per-part, multi-scan extractor this module replaced."""
+    if not text:
+        return []
+    parts = [p.strip() for p in re.split(r"\s+и\s+", text) if p.strip()]
+    tasks = []
+    for part in parts:
+        due = _legacy_parse_date(part)
+        clean_title = _legacy_strip_date_tokens(part)
+        if clean_title:
+            tasks.append(Task(title=clean_title.capitalize(), due_date=due))
+    return tasks
+
+
+def measure(extractors: dict, messages: list[str], rounds: int) -> dict[str, float]:
+    """Best-of-rounds messages/second; rounds alternate between extractors."""
+    best = dict.fromkeys(extractors, float("inf"))
+    for _ in range(rounds):
+        for name, extract in extractors.items():
+            started = time.perf_counter()
+            for text in messages:
+                extract(text)
+            best[name] = min(best[name], time.perf_counter() - started)
+    return {name: len(messages) / seconds for name, seconds in best.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    mismatches = sum(extract_tasks(text) != legacy_extract_tasks(text) for text in CORPUS)
+    dated = [text for text in CORPUS if any(task.due_date for task in extract_tasks(text))]
+    undated = [text for text in CORPUS if text not in dated]
+    extractors = {"legacy": legacy_extract_tasks, "current": extract_tasks}
+
+    result = {"benchmark": "task_extraction", "messages": len(CORPUS) * args.repeat, "corpus_mismatches": mismatches}
+    for name, corpus in (("", CORPUS), ("dated_", dated), ("undated_", undated)):
+        rates = measure(extractors, list(corpus) * args.repeat, args.rounds)
+        if not name:
+            result["legacy_messages_per_second"] = round(rates["legacy"], 1)
+            result["messages_per_second"] = round(rates["current"], 1)
+        result[f"{name}speedup"] = round(rates["current"] / rates["legacy"], 3)
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()